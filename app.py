@@ -15,7 +15,7 @@ import re
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from agents.training_generator.agent import training_agent
-from agents.training_generator.state import create_initial_state
+from agents.training_generator.state import StateView, create_initial_state
 
 # ============================================================================
 # PAGE CONFIGURATION
@@ -211,7 +211,7 @@ if generate_button:
                 status_text.text("📚 Gathering documentation and test cases...")
                 progress_bar.progress(60)
                 
-                final_state = training_agent.invoke(initial_state)
+                final_state = StateView.from_state(training_agent.invoke(initial_state))
                 
                 status_text.text("📝 Generating training content...")
                 progress_bar.progress(90)
@@ -229,7 +229,7 @@ if generate_button:
                 # DISPLAY RESULTS
                 # ============================================================
                 
-                if final_state['markdown_output']:
+                if final_state.markdown_output:
                     st.markdown('<div class="success-box">✅ <strong>Training module generated successfully!</strong></div>', unsafe_allow_html=True)
                     
                     # Statistics
@@ -238,19 +238,19 @@ if generate_button:
                     col1, col2, col3, col4, col5 = st.columns(5)
                     
                     with col1:
-                        st.metric("📚 Stories", len(final_state['stories']))
+                        st.metric("📚 Stories", len(final_state.stories))
                     
                     with col2:
-                        st.metric("📖 Documentation", len(final_state['documentation']))
+                        st.metric("📖 Documentation", len(final_state.documentation))
                     
                     with col3:
-                        st.metric("🧪 Test Cases", len(final_state['test_cases']))
+                        st.metric("🧪 Test Cases", len(final_state.test_cases))
                     
                     with col4:
-                        st.metric("📦 Total Artifacts", final_state['total_artifacts_found'])
+                        st.metric("📦 Total Artifacts", final_state.total_artifacts_found)
                     
                     with col5:
-                        st.metric("🔄 Iterations", f"{final_state['iteration']}/{final_state['max_iterations']}")
+                        st.metric("🔄 Iterations", f"{final_state.iteration}/{final_state.max_iterations}")
                     
                     st.divider()
                     
@@ -265,7 +265,7 @@ if generate_button:
                     with col1:
                         st.download_button(
                             label="📥 Download Markdown",
-                            data=final_state['markdown_output'],
+                            data=final_state.markdown_output,
                             file_name=filename,
                             mime="text/markdown",
                             use_container_width=True
@@ -274,13 +274,13 @@ if generate_button:
                     with col2:
                         # Copy to clipboard button (using streamlit)
                         if st.button("📋 Copy to Clipboard", use_container_width=True):
-                            st.code(final_state['markdown_output'], language="markdown")
+                            st.code(final_state.markdown_output, language="markdown")
                             st.info("👆 Select all and copy the content above")
                     
                     with col3:
                         # Save locally
                         output_path = Path(filename)
-                        output_path.write_text(final_state['markdown_output'], encoding='utf-8')
+                        output_path.write_text(final_state.markdown_output, encoding='utf-8')
                         st.success(f"💾 Saved: {filename}")
                     
                     st.divider()
@@ -292,60 +292,60 @@ if generate_button:
                     tab1, tab2 = st.tabs(["📖 Rendered View", "📝 Raw Markdown"])
                     
                     with tab1:
-                        st.markdown(final_state['markdown_output'])
+                        st.markdown(final_state.markdown_output)
                     
                     with tab2:
-                        st.code(final_state['markdown_output'], language="markdown")
+                        st.code(final_state.markdown_output, language="markdown")
                     
                     # Show collected artifacts details
                     with st.expander("🔍 View Detailed Artifact Information"):
                         
                         # Stories
-                        if final_state['stories']:
+                        if final_state.stories:
                             st.markdown("### 📚 User Stories")
-                            for idx, story in enumerate(final_state['stories'], 1):
+                            for idx, story in enumerate(final_state.stories, 1):
                                 with st.container():
                                     st.markdown(f"""
-                                    **{idx}. {story['id']}**: {story['metadata'].get('title', 'N/A')}  
-                                    - **Relevance Score:** {story.get('score', 0):.3f} (lower = more relevant)  
-                                    - **Priority:** {story['metadata'].get('priority', 'N/A')}  
-                                    - **Status:** {story['metadata'].get('status', 'N/A')}  
-                                    - **Story Points:** {story['metadata'].get('story_points', 'N/A')}  
-                                    - **Epic:** {story['metadata'].get('epic', 'N/A')}
+                                    **{idx}. {story.id}**: {story.metadata.get('title', 'N/A')}  
+                                    - **Relevance Score:** {story.score:.3f} (lower = more relevant)  
+                                    - **Priority:** {story.metadata.get('priority', 'N/A')}  
+                                    - **Status:** {story.metadata.get('status', 'N/A')}  
+                                    - **Story Points:** {story.metadata.get('story_points', 'N/A')}  
+                                    - **Epic:** {story.metadata.get('epic', 'N/A')}
                                     """)
                             st.divider()
                         
                         # Documentation
-                        if final_state['documentation']:
+                        if final_state.documentation:
                             st.markdown("### 📖 Documentation")
-                            for idx, doc in enumerate(final_state['documentation'], 1):
+                            for idx, doc in enumerate(final_state.documentation, 1):
                                 with st.container():
                                     st.markdown(f"""
-                                    **{idx}. {doc['id']}**: {doc['metadata'].get('title', 'N/A')}  
-                                    - **Relevance Score:** {doc.get('score', 0):.3f}  
-                                    - **Type:** {doc['metadata'].get('doc_type', 'N/A')}  
+                                    **{idx}. {doc.id}**: {doc.metadata.get('title', 'N/A')}  
+                                    - **Relevance Score:** {doc.score:.3f}  
+                                    - **Type:** {doc.metadata.get('doc_type', 'N/A')}  
                                     - **Source:** Confluence
                                     """)
                             st.divider()
                         
                         # Test Cases
-                        if final_state['test_cases']:
+                        if final_state.test_cases:
                             st.markdown("### 🧪 Test Cases")
-                            for idx, test in enumerate(final_state['test_cases'], 1):
+                            for idx, test in enumerate(final_state.test_cases, 1):
                                 with st.container():
                                     st.markdown(f"""
-                                    **{idx}. {test['id']}**: {test['metadata'].get('title', 'N/A')}  
-                                    - **Objective:** {test['metadata'].get('objective', 'N/A')[:80]}...  
-                                    - **Priority:** {test['metadata'].get('priority', 'N/A')}  
-                                    - **Test Type:** {test['metadata'].get('test_type', 'N/A')}  
-                                    - **Automation:** {test['metadata'].get('automation_status', 'N/A')}
+                                    **{idx}. {test.id}**: {test.metadata.get('title', 'N/A')}  
+                                    - **Objective:** {test.metadata.get('objective', 'N/A')[:80]}...  
+                                    - **Priority:** {test.metadata.get('priority', 'N/A')}  
+                                    - **Test Type:** {test.metadata.get('test_type', 'N/A')}  
+                                    - **Automation:** {test.metadata.get('automation_status', 'N/A')}
                                     """)
                         
                         # Show relationships
-                        if final_state['story_test_map']:
+                        if final_state.story_test_map:
                             st.divider()
                             st.markdown("### 🔗 Story-Test Relationships")
-                            for story_id, test_ids in final_state['story_test_map'].items():
+                            for story_id, test_ids in final_state.story_test_map.items():
                                 st.markdown(f"- **{story_id}** → {len(test_ids)} test cases: {', '.join(test_ids[:5])}{'...' if len(test_ids) > 5 else ''}")
                 
                 else:
@@ -354,14 +354,14 @@ if generate_button:
                     # Show what was collected
                     st.markdown(f"""
                     **Module:** {module_name}  
-                    **Stories Found:** {len(final_state['stories'])}  
-                    **Documentation Found:** {len(final_state['documentation'])}  
-                    **Test Cases Found:** {len(final_state['test_cases'])}  
-                    **Iterations Used:** {final_state['iteration']}/{final_state['max_iterations']}
+                    **Stories Found:** {len(final_state.stories)}  
+                    **Documentation Found:** {len(final_state.documentation)}  
+                    **Test Cases Found:** {len(final_state.test_cases)}  
+                    **Iterations Used:** {final_state.iteration}/{final_state.max_iterations}
                     """)
                     
-                    if final_state.get('error_message'):
-                        st.error(f"**Error:** {final_state['error_message']}")
+                    if final_state.error_message:
+                        st.error(f"**Error:** {final_state.error_message}")
                     
                     st.info("""
                     **Possible reasons:**
@@ -4,6 +4,7 @@ Easy to swap Qdrant with other vector stores (Pinecone, Chroma, etc.)
 """
 
 import json
+import uuid
 from pathlib import Path
 from typing import List, Dict
 import sys
@@ -12,11 +13,13 @@ import sys
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_qdrant import QdrantVectorStore
 from langchain_core.documents import Document
 from qdrant_client import QdrantClient
+from qdrant_client.models import PayloadSchemaType
 from src.agents.training_generator.config import config
+from src.agents.training_generator.utils.ids import point_id
+from src.agents.training_generator.tools.rag_tools import PAYLOAD_INDEX_FIELDS, INT8_QUANTIZATION, get_embeddings
 from rich.console import Console
 from rich.progress import Progress
 
@@ -137,6 +140,11 @@ def convert_to_langchain_documents(documents: List[Dict]) -> List[Document]:
                 "content": json.dumps(doc)  # Store full document as JSON
             }
             
+            # Filterable story links, so one scroll can find every test
+            # case linked to a set of stories
+            if doc_type == "test_case":
+                metadata["linked_stories"] = doc.get('linked_stories', [])
+            
             # Create LangChain Document
             langchain_doc = Document(
                 page_content=page_content,
@@ -168,15 +176,13 @@ def index_documents():
     console.print(f"   Vector Store: Qdrant")
     console.print(f"   Qdrant URL: {config.QDRANT_URL}")
     console.print(f"   Collection: {config.QDRANT_COLLECTION_NAME}")
-    console.print(f"   Embedding Model: sentence-transformers/{config.EMBEDDING_MODEL_NAME}")
+    console.print(f"   Embedding Model: sentence-transformers/{config.EMBEDDING_MODEL_NAME} ({config.EMBEDDING_MODEL_TYPE})")
     
-    # Initialize embeddings
+    # Initialize embeddings - the same model/backend RAGTools embeds
+    # queries with, so EMBEDDING_MODEL_TYPE=onnx indexes with ONNX too.
+    # Document vectors bypass the on-disk cache, which is meant for queries
     console.print(f"\n📥 Loading embedding model...")
-    embeddings = HuggingFaceEmbeddings(
-        model_name=f"sentence-transformers/{config.EMBEDDING_MODEL_NAME}",
-        model_kwargs={'device': 'cpu'},
-        encode_kwargs={'normalize_embeddings': True}
-    )
+    embeddings = get_embeddings().underlying_embeddings
     console.print("✅ Embedding model loaded")
     
     # Test Qdrant connection
@@ -228,20 +234,45 @@ def index_documents():
         # Using LangChain's from_documents - handles everything!
         vector_store = QdrantVectorStore.from_documents(
             documents=langchain_documents,
+            # Deterministic point IDs let RAGTools fetch documents by ID
+            # with a single retrieve call; documents without an ID share
+            # "unknown", so they get random IDs instead of overwriting
+            # each other
+            ids=[
+                str(uuid.uuid4()) if doc.metadata["document_id"] == "unknown"
+                else point_id(doc.metadata["document_id"])
+                for doc in langchain_documents
+            ],
             embedding=embeddings,
             url=config.QDRANT_URL,
             api_key=config.QDRANT_API_KEY,
             collection_name=config.QDRANT_COLLECTION_NAME,
-            force_recreate=True  # Recreate collection
+            force_recreate=True,  # Recreate collection
+            # Quantize from the start instead of re-quantizing at first query
+            collection_create_options=(
+                {"quantization_config": INT8_QUANTIZATION} if config.QDRANT_QUANTIZATION else {}
+            ),
         )
         console.print("✅ Indexing complete!")
     except Exception as e:
         console.print(f"[bold red]❌ Indexing failed: {e}[/bold red]")
         return
     
+    client = QdrantClient(url=config.QDRANT_URL, api_key=config.QDRANT_API_KEY)
+    
+    # Keyword indexes on every filtered field, so type/module/ID filters
+    # are applied inside the HNSW search instead of by scanning payloads
+    console.print(f"\n🗂️  Creating payload indexes...")
+    for field in PAYLOAD_INDEX_FIELDS:
+        client.create_payload_index(
+            collection_name=config.QDRANT_COLLECTION_NAME,
+            field_name=field,
+            field_schema=PayloadSchemaType.KEYWORD,
+        )
+    console.print(f"✅ Indexed {len(PAYLOAD_INDEX_FIELDS)} payload fields")
+    
     # Verify indexing
     console.print(f"\n🔍 Verifying indexing...")
-    client = QdrantClient(url=config.QDRANT_URL, api_key=config.QDRANT_API_KEY)
     collection_info = client.get_collection(config.QDRANT_COLLECTION_NAME)
     
     console.print("\n[bold green]✅ Indexing Complete![/bold green]\n")
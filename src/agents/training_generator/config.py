@@ -23,6 +23,12 @@ class Config:
     QDRANT_URL: str = os.getenv("QDRANT_URL", "http://localhost:6333")
     QDRANT_API_KEY: Optional[str] = os.getenv("QDRANT_API_KEY") or None
     QDRANT_COLLECTION_NAME: str = os.getenv("QDRANT_COLLECTION_NAME", "tasconnect_knowledge_base")
+    QDRANT_PREFER_GRPC: bool = os.getenv("QDRANT_PREFER_GRPC", "true").lower() == "true"
+    QDRANT_GRPC_PORT: int = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
+    QDRANT_TIMEOUT: int = int(os.getenv("QDRANT_TIMEOUT", "10"))
+    QDRANT_QUANTIZATION: bool = os.getenv("QDRANT_QUANTIZATION", "true").lower() == "true"
+    QDRANT_HNSW_EF: int = int(os.getenv("QDRANT_HNSW_EF", "64"))
+    QDRANT_OVERSAMPLING: float = float(os.getenv("QDRANT_OVERSAMPLING", "2.0"))
     
     # Neo4j
     NEO4J_URI: str = os.getenv("NEO4J_URI", "bolt://localhost:7687")
@@ -37,12 +43,24 @@ class Config:
     # Embeddings
     EMBEDDING_MODEL_NAME: str = os.getenv("EMBEDDING_MODEL_NAME", "all-MiniLM-L6-v2")
     EMBEDDING_MODEL_TYPE: str = os.getenv("EMBEDDING_MODEL_TYPE", "sentence-transformers")
+    ONNX_MODEL_FILE: str = os.getenv("ONNX_MODEL_FILE", "onnx/model_quint8_avx2.onnx")
+    ONNX_INTRA_OP_THREADS: int = int(os.getenv("ONNX_INTRA_OP_THREADS", "0"))
+    EMBEDDING_CACHE_DIR: str = os.getenv("EMBEDDING_CACHE_DIR", ".cache/embeddings")
     
     # Agent config
     MAX_ITERATIONS: int = int(os.getenv("MAX_ITERATIONS", "8"))
     SEARCH_TOP_K: int = int(os.getenv("SEARCH_TOP_K", "10"))
     MIN_RELEVANCE_SCORE: float = float(os.getenv("MIN_RELEVANCE_SCORE", "0.5"))  
     
+    # Smoke mode: deterministic stand-ins for every LLM call, so the graph
+    # and RAG tools can be exercised without Azure OpenAI
+    TRAINING_AGENT_SMOKE: bool = os.getenv("TRAINING_AGENT_SMOKE", "false").lower() in ("1", "true")
+    
+    # Query cache
+    QUERY_CACHE_SIZE: int = int(os.getenv("QUERY_CACHE_SIZE", "2000"))
+    QUERY_CACHE_TTL: float = float(os.getenv("QUERY_CACHE_TTL", "600"))
+    SEMANTIC_CACHE_THRESHOLD: float = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.97"))
+    
     # LangSmith (optional)
     LANGSMITH_API_KEY: Optional[str] = os.getenv("LANGSMITH_API_KEY") or None
     LANGSMITH_TRACING: bool = os.getenv("LANGSMITH_TRACING", "false").lower() == "true"
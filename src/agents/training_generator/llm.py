@@ -67,8 +67,8 @@ def get_structured_llm(
     return llm.with_structured_output(pydantic_model)
 
 
-# Create default LLM instances for convenience
-default_llm = get_llm()
+# Create default LLM instances for convenience (none in smoke mode)
+default_llm = None if config.TRAINING_AGENT_SMOKE else get_llm()
 
 
 if __name__ == "__main__":
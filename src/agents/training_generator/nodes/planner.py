@@ -8,6 +8,7 @@ from langgraph.types import Command
 from typing import Literal
 
 from ..state import TrainingGeneratorState
+from ..config import config
 from ..models import PlannerDecision
 from ..llm import get_structured_llm
 from ..prompts.planner_prompt import get_planner_prompt
@@ -143,6 +144,18 @@ def planner(state: TrainingGeneratorState) -> Command[Literal["tools", "__end__"
     # Fallback: Use LLM Decision (for complex cases)
     # ========================================================================
     
+    # Smoke runs: deterministic stand-in for the LLM decision
+    if config.TRAINING_AGENT_SMOKE:
+        has_data = bool(state['stories'] or state['documentation'])
+        return Command(
+            goto="tools" if has_data else "__end__",
+            update={
+                "current_action": "generate_markdown" if has_data else "complete",
+                "reasoning": "Smoke mode: deterministic planner decision",
+                "iteration": state["iteration"] + 1
+            }
+        )
+    
     print(f"  🤔 Using LLM decision (iteration {state['iteration'] + 1})")
     
     # Get LLM with structured output
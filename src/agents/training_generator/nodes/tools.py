@@ -9,10 +9,11 @@ from ..tools.rag_tools import (
     search_stories,
     search_documentation,
     search_test_cases,
-    find_test_cases_by_stories,
+    fetch_stories_with_tests,
     batch_retrieve_by_ids
 )
 from ..llm import get_llm
+from ..config import config
 import json
 import re
 
@@ -39,16 +40,20 @@ def llm_filter_results(
     if not search_results:
         return [], None
     
+    # Smoke runs keep the search ranking instead of asking the LLM
+    if config.TRAINING_AGENT_SMOKE:
+        return search_results[:max_results], search_results[0].module
+    
     # Prepare results summary for LLM
     results_for_llm = []
     for idx, item in enumerate(search_results[:30]):  # Check top 30
         results_for_llm.append({
             "index": idx,
-            "id": item.get('id', 'unknown'),
-            "module": item.get('module', 'Unknown'),
-            "title": item.get('metadata', {}).get('title', 'N/A')[:150],
-            "description": item.get('metadata', {}).get('description', '')[:200],
-            "score": round(item.get('score', 1.0), 3)
+            "id": item.id,
+            "module": item.module or 'Unknown',
+            "title": item.metadata.get('title', 'N/A')[:150],
+            "description": item.metadata.get('description', '')[:200],
+            "score": round(item.score, 3)
         })
     
     # Create intelligent prompt
@@ -117,8 +122,8 @@ Respond with ONLY valid JSON, no other text."""
     
     # Fallback: Use top results by score
     print(f"  ⚠️  Falling back to score-based selection")
-    sorted_results = sorted(search_results, key=lambda x: x.get('score', 1.0))
-    detected_module = sorted_results[0].get('module') if sorted_results else None
+    sorted_results = sorted(search_results, key=lambda x: x.score)
+    detected_module = sorted_results[0].module if sorted_results else None
     return sorted_results[:max_results], detected_module
 
 
@@ -143,7 +148,10 @@ def tools(state: TrainingGeneratorState) -> dict:
         query = user_module
         
         # Get broad semantic search results
-        all_stories = search_stories(query, module=None, top_k=30)
+        all_stories = search_stories(
+            query, module=None, top_k=30,
+            exclude_ids={s.id for s in state['stories']}
+        )
         
         print(f"  📊 Semantic search returned {len(all_stories)} candidate stories")
         
@@ -161,7 +169,7 @@ def tools(state: TrainingGeneratorState) -> dict:
             
             updates = {
                 "stories": filtered_stories,
-                "total_artifacts_found": state['total_artifacts_found'] + len(filtered_stories)
+                "total_artifacts_found": len(filtered_stories)
             }
             
             # Update module name if LLM detected a better one
@@ -174,7 +182,7 @@ def tools(state: TrainingGeneratorState) -> dict:
             print(f"  ⚠️  No relevant stories found")
             return {
                 "stories": [],
-                "total_artifacts_found": state['total_artifacts_found']
+                "total_artifacts_found": 0
             }
     
     # ========================================================================
@@ -190,7 +198,10 @@ def tools(state: TrainingGeneratorState) -> dict:
         query = f"{actual_module} documentation guide"
         
         # Broad search
-        all_docs = search_documentation(query, module=None, top_k=30)
+        all_docs = search_documentation(
+            query, module=None, top_k=30,
+            exclude_ids={d.id for d in state['documentation']}
+        )
         
         print(f"  📊 Semantic search returned {len(all_docs)} candidate docs")
         
@@ -204,7 +215,7 @@ def tools(state: TrainingGeneratorState) -> dict:
         
         return {
             "documentation": filtered_docs,
-            "total_artifacts_found": state['total_artifacts_found'] + len(filtered_docs)
+            "total_artifacts_found": len(filtered_docs)
         }
     
     # ========================================================================
@@ -220,7 +231,10 @@ def tools(state: TrainingGeneratorState) -> dict:
         query = f"{actual_module} test verify"
         
         # Broad search
-        all_tests = search_test_cases(query, module=None, top_k=30)
+        all_tests = search_test_cases(
+            query, module=None, top_k=30,
+            exclude_ids={t.id for t in state['test_cases']}
+        )
         
         print(f"  📊 Semantic search returned {len(all_tests)} candidate tests")
         
@@ -234,7 +248,7 @@ def tools(state: TrainingGeneratorState) -> dict:
         
         return {
             "test_cases": filtered_tests,
-            "total_artifacts_found": state['total_artifacts_found'] + len(filtered_tests),
+            "total_artifacts_found": len(filtered_tests),
             "gathering_complete": True
         }
     
@@ -243,18 +257,25 @@ def tools(state: TrainingGeneratorState) -> dict:
     # ========================================================================
     
     elif action == "find_relationships":
-        story_ids = [s['id'] for s in state['stories']]
+        story_ids = [s.id for s in state['stories']]
         
         if not story_ids:
             print("  ⚠️  No stories available")
             return {"story_test_map": {}}
         
-        story_test_map = find_test_cases_by_stories(story_ids)
+        # Links and linked test payloads come back together, so the
+        # planner can skip the separate fetch_test_details round-trip
+        story_test_map, test_cases = fetch_stories_with_tests(story_ids)
         
         total_tests = sum(len(tests) for tests in story_test_map.values())
         print(f"  🔗 Found relationships: {len(story_test_map)} stories → {total_tests} test cases")
+        print(f"  ✅ Retrieved {len(test_cases)} linked test cases")
         
-        return {"story_test_map": story_test_map}
+        return {
+            "story_test_map": story_test_map,
+            "test_cases": test_cases,
+            "total_artifacts_found": len(test_cases)
+        }
     
     # ========================================================================
     # ACTION: Fetch Test Details
@@ -279,7 +300,7 @@ def tools(state: TrainingGeneratorState) -> dict:
         
         return {
             "test_cases": test_cases,
-            "total_artifacts_found": state['total_artifacts_found'] + len(test_cases)
+            "total_artifacts_found": len(test_cases)
         }
     
     # ========================================================================
@@ -344,8 +365,8 @@ Total: **{len(stories)}**
     
     if stories:
         for idx, story in enumerate(stories, 1):
-            meta = story.get('metadata', {})
-            markdown += f"""### {idx}. {story.get('id')}: {meta.get('title', 'N/A')}
+            meta = story.metadata
+            markdown += f"""### {idx}. {story.id}: {meta.get('title', 'N/A')}
 
 **Priority:** {meta.get('priority')} | **Status:** {meta.get('status')} | **Points:** {meta.get('story_points')}
 
@@ -361,8 +382,8 @@ Total: **{len(stories)}**
     
     if docs:
         for idx, doc in enumerate(docs, 1):
-            meta = doc.get('metadata', {})
-            markdown += f"""### {idx}. {doc.get('id')}: {meta.get('title')}
+            meta = doc.metadata
+            markdown += f"""### {idx}. {doc.id}: {meta.get('title')}
 
 {meta.get('content', '')[:400]}...
 
@@ -372,8 +393,8 @@ Total: **{len(stories)}**
     
     if tests:
         for idx, test in enumerate(tests, 1):
-            meta = test.get('metadata', {})
-            markdown += f"""### {idx}. {test.get('id')}: {meta.get('title')}
+            meta = test.metadata
+            markdown += f"""### {idx}. {test.id}: {meta.get('title')}
 
 **Objective:** {meta.get('objective')}  
 **Priority:** {meta.get('priority')}
@@ -7,11 +7,59 @@ Uses TypedDict for type safety and Annotated for custom reducers.
 Based on LangGraph v0.2+ state management patterns.
 """
 
-from typing import TypedDict, List, Dict, Annotated, Optional
+from typing import TypedDict, List, Dict, Annotated, Optional, Mapping
+from dataclasses import dataclass
 from datetime import datetime
 import operator
 
 
+# Actions the planner is allowed to put in `current_action`
+_VALID_ACTIONS: frozenset[str] = frozenset({
+    'initialize', 'search_stories', 'search_docs',
+    'find_relationships', 'fetch_test_details',
+    'generate_markdown', 'complete'
+})
+
+
+# ============================================================================
+# ARTIFACT RECORD
+# ============================================================================
+
+@dataclass(slots=True, frozen=True)
+class Artifact:
+    """
+    A single collected artifact (JIRA story, Confluence doc or Zephyr test).
+    
+    Slotted so that runs holding hundreds of artifacts avoid a per-record
+    dict, and field reads are plain attribute loads.
+    """
+    
+    id: str
+    """Document ID (e.g., 'PAY-001', 'TC-PAY-001')"""
+    
+    score: float
+    """Relevance score from vector search (1.0 for exact ID lookups)"""
+    
+    document_type: str
+    """'jira_story' | 'confluence_doc' | 'test_case'"""
+    
+    module: str
+    """Module the artifact belongs to"""
+    
+    metadata: Mapping
+    """Full source document (title, description, ...) plus 'source'"""
+    
+    def to_dict(self) -> Dict:
+        """Plain dict form for JSON/markdown rendering"""
+        return {
+            'id': self.id,
+            'score': self.score,
+            'document_type': self.document_type,
+            'module': self.module,
+            'metadata': dict(self.metadata),
+        }
+
+
 # ============================================================================
 # STATE SCHEMA
 # ============================================================================
@@ -73,58 +121,43 @@ class TrainingGeneratorState(TypedDict):
     # COLLECTED DATA (Using operator.add for list accumulation)
     # ========================================================================
     
-    stories: Annotated[List[Dict], operator.add]
+    stories: Annotated[List[Artifact], operator.add]
     """
     Collected JIRA stories/epics.
-    Each story is a dict with:
+    Each story is an Artifact whose metadata holds:
     {
-        'id': str,
-        'content': str,
-        'metadata': {
-            'source': 'JIRA',
-            'type': 'user_story' | 'epic',
-            'title': str,
-            'epic': str,
-            ...
-        },
-        'score': float  # relevance score from vector search
+        'source': 'JIRA',
+        'type': 'User Story',
+        'title': str,
+        'epic': str,
+        'linked_issues': {...},
+        ...
     }
     """
     
-    documentation: Annotated[List[Dict], operator.add]
+    documentation: Annotated[List[Artifact], operator.add]
     """
     Collected Confluence documentation.
-    Each doc is a dict with:
+    Each doc is an Artifact whose metadata holds:
     {
-        'id': str,
+        'source': 'Confluence',
+        'type': 'technical_documentation' | 'user_guide' | ...,
+        'title': str,
         'content': str,
-        'metadata': {
-            'source': 'Confluence',
-            'type': 'documentation',
-            'title': str,
-            'page_id': str,
-            ...
-        },
-        'score': float
+        ...
     }
     """
     
-    test_cases: Annotated[List[Dict], operator.add]
+    test_cases: Annotated[List[Artifact], operator.add]
     """
     Collected Zephyr test cases.
-    Each test case is a dict with:
+    Each test case is an Artifact whose metadata holds:
     {
-        'id': str,
-        'content': str,
-        'metadata': {
-            'source': 'Zephyr',
-            'type': 'test_case',
-            'title': str,
-            'steps': List[str],
-            'expected_result': str,
-            ...
-        },
-        'score': float
+        'source': 'Zephyr',
+        'title': str,
+        'objective': str,
+        'test_steps': List[Dict],
+        ...
     }
     """
     
@@ -165,13 +198,60 @@ class TrainingGeneratorState(TypedDict):
     generation_timestamp: str
     """ISO format timestamp of when generation started"""
     
-    total_artifacts_found: int
-    """Total number of artifacts collected (stories + docs + tests)"""
+    total_artifacts_found: Annotated[int, operator.add]
+    """
+    Total number of artifacts collected (stories + docs + tests).
+    Nodes return the number of artifacts they added; the reducer keeps
+    the running total so nobody has to re-count the collected lists.
+    """
     
     error_message: Optional[str]
     """Error message if generation fails"""
 
 
+# ============================================================================
+# FINAL STATE VIEW
+# ============================================================================
+
+@dataclass(slots=True, frozen=True)
+class StateView:
+    """
+    Read-only snapshot of a finished run, for callers that read the result
+    many times (UI, scripts).
+    
+    The graph itself keeps passing TrainingGeneratorState dicts, since the
+    LangGraph reducers work on the TypedDict schema; this is built once
+    from the final state so later reads are attribute loads.
+    """
+    
+    module_name: str
+    iteration: int
+    max_iterations: int
+    stories: List[Artifact]
+    documentation: List[Artifact]
+    test_cases: List[Artifact]
+    story_test_map: Dict[str, List[str]]
+    markdown_output: str
+    total_artifacts_found: int
+    error_message: Optional[str]
+    
+    @classmethod
+    def from_state(cls, state: TrainingGeneratorState) -> "StateView":
+        """Snapshot the fields of a (final) agent state"""
+        return cls(
+            module_name=state['module_name'],
+            iteration=state['iteration'],
+            max_iterations=state['max_iterations'],
+            stories=state['stories'],
+            documentation=state['documentation'],
+            test_cases=state['test_cases'],
+            story_test_map=state['story_test_map'],
+            markdown_output=state['markdown_output'],
+            total_artifacts_found=state['total_artifacts_found'],
+            error_message=state.get('error_message'),
+        )
+
+
 # ============================================================================
 # STATE INITIALIZATION
 # ============================================================================
@@ -225,6 +305,33 @@ def create_initial_state(user_request: str, module_name: str) -> TrainingGenerat
 # STATE HELPER FUNCTIONS
 # ============================================================================
 
+_SEP = '=' * 50
+
+# Built once at import; get_state_summary only fills in the values
+_SUMMARY_TEMPLATE = (
+    "Training Generation State Summary\n"
+    + _SEP + "\n"
+    "Module: {module_name}\n"
+    "Iteration: {iteration}/{max_iterations}\n"
+    "Current Action: {current_action}\n"
+    "Gathering Complete: {gathering_complete}\n"
+    "\n"
+    "Data Collected:\n"
+    "- Stories: {stories}\n"
+    "- Documentation: {documentation}\n"
+    "- Test Cases: {test_cases}\n"
+    "- Total Artifacts: {total_artifacts}\n"
+    "\n"
+    "Relationships:\n"
+    "- Story-Test Mappings: {story_test_mappings}\n"
+    "- Story-Doc Mappings: {story_doc_mappings}\n"
+    "\n"
+    "Output Status: {output_status}\n"
+    "Queries Made: {queries_made}\n"
+    + _SEP
+)
+
+
 def get_state_summary(state: TrainingGeneratorState) -> str:
     """
     Get a human-readable summary of the current state.
@@ -235,28 +342,21 @@ def get_state_summary(state: TrainingGeneratorState) -> str:
     Returns:
         Formatted summary string
     """
-    return f"""
-Training Generation State Summary
-{'='*50}
-Module: {state['module_name']}
-Iteration: {state['iteration']}/{state['max_iterations']}
-Current Action: {state['current_action']}
-Gathering Complete: {state['gathering_complete']}
-
-Data Collected:
-- Stories: {len(state['stories'])}
-- Documentation: {len(state['documentation'])}
-- Test Cases: {len(state['test_cases'])}
-- Total Artifacts: {state['total_artifacts_found']}
-
-Relationships:
-- Story-Test Mappings: {len(state['story_test_map'])}
-- Story-Doc Mappings: {len(state['story_doc_map'])}
-
-Output Status: {'Generated' if state['markdown_output'] else 'Pending'}
-Queries Made: {len(state['queries_made'])}
-{'='*50}
-    """.strip()
+    return _SUMMARY_TEMPLATE.format(
+        module_name=state['module_name'],
+        iteration=state['iteration'],
+        max_iterations=state['max_iterations'],
+        current_action=state['current_action'],
+        gathering_complete=state['gathering_complete'],
+        stories=len(state['stories']),
+        documentation=len(state['documentation']),
+        test_cases=len(state['test_cases']),
+        total_artifacts=state['total_artifacts_found'],
+        story_test_mappings=len(state['story_test_map']),
+        story_doc_mappings=len(state['story_doc_map']),
+        output_status='Generated' if state['markdown_output'] else 'Pending',
+        queries_made=len(state['queries_made']),
+    )
 
 
 def validate_state(state: TrainingGeneratorState) -> tuple[bool, Optional[str]]:
@@ -278,12 +378,7 @@ def validate_state(state: TrainingGeneratorState) -> tuple[bool, Optional[str]]:
         return False, "Module name is empty"
     
     # Check action validity
-    valid_actions = {
-        'initialize', 'search_stories', 'search_docs', 
-        'find_relationships', 'fetch_test_details', 
-        'generate_markdown', 'complete'
-    }
-    if state['current_action'] not in valid_actions:
+    if state['current_action'] not in _VALID_ACTIONS:
         return False, f"Invalid action: {state['current_action']}"
     
     # Check data consistency
@@ -303,19 +398,12 @@ def should_continue_gathering(state: TrainingGeneratorState) -> bool:
     Returns:
         True if should continue, False otherwise
     """
-    # Stop if already complete
-    if state['gathering_complete']:
-        return False
-    
-    # Stop if max iterations reached
-    if state['iteration'] >= state['max_iterations']:
-        return False
-    
-    # Stop if markdown already generated
-    if state['markdown_output']:
-        return False
-    
-    return True
+    # Stop if already complete, max iterations reached, or markdown generated
+    return not (
+        state['gathering_complete']
+        or state['iteration'] >= state['max_iterations']
+        or state['markdown_output']
+    )
 
 
 # ============================================================================
@@ -339,12 +427,13 @@ if __name__ == "__main__":
         print(f"Error: {error}")
     
     # Test state update (simulating data collection)
-    state['stories'].append({
-        'id': 'PAY-001',
-        'content': 'As a user, I want to pay with credit card',
-        'metadata': {'source': 'JIRA', 'type': 'user_story', 'title': 'CC Payment'},
-        'score': 0.92
-    })
+    state['stories'].append(Artifact(
+        id='PAY-001',
+        score=0.92,
+        document_type='jira_story',
+        module='Payment',
+        metadata={'source': 'JIRA', 'type': 'User Story', 'title': 'CC Payment'}
+    ))
     state['iteration'] = 1
     state['total_artifacts_found'] = 1
     
@@ -0,0 +1,142 @@
+"""
+Query cache for RAG tools
+
+Two tiers in front of the vector store:
+1. Exact: same filter spec + same query text -> cached hits
+2. Semantic: same filter spec + a recent cached query whose embedding has
+   cosine similarity >= threshold with the new one -> cached hits
+
+A hit on either tier skips the Qdrant round-trip; the exact tier also
+skips embedding the query. Entries expire after `ttl_seconds`, and
+`invalidate()` drops everything after the collection is written to.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+import hashlib
+import threading
+import time
+
+import numpy as np
+
+from ._kernels import cosine_batch
+
+
+class QueryCache:
+    """Thread-safe LRU+TTL cache of search results with an embedding-similarity fallback"""
+
+    def __init__(
+        self,
+        max_size: int = 2000,
+        ttl_seconds: float = 600,
+        threshold: float = 0.97,
+        scan_size: int = 256
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.threshold = threshold
+        self.scan_size = scan_size
+
+        self._lock = threading.RLock()
+
+        # Bumped on every collection write; part of each key, so entries
+        # cached before a write can never be returned after it
+        self._version = 0
+
+        # key -> (spec, stored at, unit vector, results), oldest first
+        self._entries: "OrderedDict[bytes, Tuple[Hashable, float, np.ndarray, Any]]" = OrderedDict()
+
+        # spec -> (keys, stacked unit vectors) of its most recent entries;
+        # rebuilt lazily after changes
+        self._matrices: Dict[Hashable, Tuple[List[bytes], np.ndarray]] = {}
+
+    @property
+    def version(self) -> int:
+        """Write counter; anything cached under an older version is stale"""
+        return self._version
+
+    def _key(self, spec: Hashable, query: str) -> bytes:
+        # spec must have a deterministic repr (tuples of str/int/None)
+        raw = f"{self._version}|{spec!r}|{query}".encode("utf-8")
+        return hashlib.blake2b(raw, digest_size=16).digest()
+
+    def _lookup(self, key: bytes) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[1] > self.ttl_seconds:
+            del self._entries[key]
+            self._matrices.pop(entry[0], None)
+            return None
+        self._entries.move_to_end(key)
+        return entry[3]
+
+    def get(self, spec: Hashable, query: str) -> Optional[Any]:
+        """Exact lookup on (spec, query)"""
+        with self._lock:
+            return self._lookup(self._key(spec, query))
+
+    def get_similar(self, spec: Hashable, vector: Sequence[float]) -> Optional[Any]:
+        """Return results of the most similar recent query for `spec`, if close enough"""
+        with self._lock:
+            keys, matrix = self._matrix_for(spec)
+            if not keys:
+                return None
+
+            sims = cosine_batch(matrix, _unit(vector))
+            
+            # Best match first; an expired one falls through to the next
+            for i in np.argsort(-sims):
+                if sims[i] < self.threshold:
+                    break
+                results = self._lookup(keys[i])
+                if results is not None:
+                    return results
+            return None
+
+    def put(self, spec: Hashable, query: str, vector: Sequence[float], results: Any):
+        """Store results for (spec, query), evicting the least recently used entry"""
+        with self._lock:
+            key = self._key(spec, query)
+            self._entries[key] = (spec, time.monotonic(), _unit(vector), results)
+            self._entries.move_to_end(key)
+            self._matrices.pop(spec, None)
+
+            while len(self._entries) > self.max_size:
+                _, (old_spec, *_) = self._entries.popitem(last=False)
+                self._matrices.pop(old_spec, None)
+
+    def invalidate(self):
+        """Forget every cached result; call after upserts/deletes"""
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+            self._matrices.clear()
+
+    def clear(self):
+        """Drop every cached entry"""
+        with self._lock:
+            self._entries.clear()
+            self._matrices.clear()
+
+    def _matrix_for(self, spec: Hashable) -> Tuple[List[bytes], np.ndarray]:
+        cached = self._matrices.get(spec)
+        if cached is None:
+            keys, vectors = [], []
+            # Newest first, so the scan stays bounded by scan_size
+            for key, (entry_spec, _, vector, _) in reversed(self._entries.items()):
+                if entry_spec == spec:
+                    keys.append(key)
+                    vectors.append(vector)
+                    if len(keys) == self.scan_size:
+                        break
+            matrix = np.vstack(vectors) if vectors else np.empty((0, 0), dtype=np.float32)
+            cached = self._matrices[spec] = (keys, matrix)
+        return cached
+
+
+def _unit(vector: Sequence[float]) -> np.ndarray:
+    """L2-normalized float32 copy, so a dot product is the cosine"""
+    v = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(v)
+    return v / norm if norm else v
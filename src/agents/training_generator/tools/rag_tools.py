@@ -2,235 +2,1016 @@
 RAG Tools for Training Generator Agent - Fixed Filter Format
 """
 
-from typing import List, Dict, Optional
-import json
-from qdrant_client import QdrantClient
+from typing import List, Dict, Optional, Set, Iterator, Tuple, Mapping
+from collections import defaultdict, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from weakref import WeakKeyDictionary
+import asyncio
+import re
+import threading
+import time
+import grpc
+import numpy as np
+import orjson
+from qdrant_client import AsyncQdrantClient, QdrantClient
+from qdrant_client.models import (
+    Filter,
+    FieldCondition,
+    MatchAny,
+    MatchValue,
+    PayloadSchemaType,
+    QueryRequest,
+    QuantizationSearchParams,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+)
+from qdrant_client.http.exceptions import UnexpectedResponse
 from langchain_qdrant import QdrantVectorStore
 from langchain_huggingface import HuggingFaceEmbeddings
 
+# langchain >= 1.0 moved these to the langchain-classic package
+try:
+    from langchain_classic.embeddings import CacheBackedEmbeddings
+    from langchain_classic.storage import LocalFileStore
+except ImportError:
+    from langchain.embeddings import CacheBackedEmbeddings
+    from langchain.storage import LocalFileStore
+
 try:
     from ..config import config
+    from ..state import Artifact
+    from ..utils.ids import point_id
+    from .query_cache import QueryCache
+    from .bloom import BloomFilter
 except ImportError:
     import sys
     from pathlib import Path
     sys.path.insert(0, str(Path(__file__).parents[3]))
     from agents.training_generator.config import config
+    from agents.training_generator.state import Artifact
+    from agents.training_generator.utils.ids import point_id
+    from agents.training_generator.tools.query_cache import QueryCache
+    from agents.training_generator.tools.bloom import BloomFilter
+
+
+# Map source to document type
+SOURCE_DOC_TYPES = {
+    "JIRA": "jira_story",
+    "Confluence": "confluence_doc",
+    "Zephyr": "test_case"
+}
+
+# Inverse mapping, used to tag each hit with its source
+SOURCE_FOR_TYPE = {doc_type: source for source, doc_type in SOURCE_DOC_TYPES.items()}
+
+# Payload keys every query filters on; LangChain nests them under "metadata"
+PAYLOAD_INDEX_FIELDS = (
+    "metadata.document_type",
+    "metadata.module",
+    "metadata.document_id",
+    "metadata.linked_stories",
+)
+
+# int8 scalar quantization: 384 B instead of 1536 B per MiniLM vector,
+# clipping the 1% most extreme values to keep the int8 range tight
+INT8_QUANTIZATION = ScalarQuantization(
+    scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=True)
+)
+
+
+@lru_cache(maxsize=1)
+def get_embeddings() -> CacheBackedEmbeddings:
+    """
+    Process-wide embedding model, so its weights are loaded only once.
+    
+    Vectors are persisted under EMBEDDING_CACHE_DIR, so texts embedded by
+    an earlier run skip the model entirely.
+    """
+    model_kwargs = {"device": "cpu"}
+    
+    # Same model exported to ONNX with dynamic INT8 quantization, run by
+    # ONNX Runtime (requires `pip install "sentence-transformers[onnx]"`)
+    if config.EMBEDDING_MODEL_TYPE == "onnx":
+        import onnxruntime as ort
+        
+        # Fuse attention/GELU/LayerNorm nodes when the session is built;
+        # 0 threads lets ONNX Runtime use one per physical core
+        session_options = ort.SessionOptions()
+        session_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        session_options.intra_op_num_threads = config.ONNX_INTRA_OP_THREADS
+        
+        model_kwargs.update(
+            backend="onnx",
+            model_kwargs={
+                "file_name": config.ONNX_MODEL_FILE,
+                "provider": "CPUExecutionProvider",
+                "session_options": session_options,
+            },
+        )
+    
+    model = HuggingFaceEmbeddings(
+        model_name=f"sentence-transformers/{config.EMBEDDING_MODEL_NAME}",
+        model_kwargs=model_kwargs,
+        encode_kwargs={"normalize_embeddings": True, "batch_size": 64},
+    )
+    
+    # Keys are namespace + BLAKE2b(text); the namespace keeps vectors from
+    # different models/backends apart. Keys become file names, and
+    # LocalFileStore only accepts [A-Za-z0-9_.-/] in them
+    namespace = re.sub(
+        r"[^A-Za-z0-9_.-]", "_", f"{config.EMBEDDING_MODEL_NAME}_{config.EMBEDDING_MODEL_TYPE}_"
+    )
+    store = LocalFileStore(config.EMBEDDING_CACHE_DIR)
+    return CacheBackedEmbeddings.from_bytes_store(
+        model,
+        store,
+        namespace=namespace,
+        query_embedding_cache=store,
+        key_encoder="blake2b",
+    )
+
+
+def _qdrant_client_kwargs() -> Dict:
+    """Connection settings shared by the sync and async Qdrant clients"""
+    return {
+        "url": config.QDRANT_URL,
+        "api_key": config.QDRANT_API_KEY,
+        # Protobuf over one persistent HTTP/2 channel instead of REST/JSON
+        "prefer_grpc": config.QDRANT_PREFER_GRPC,
+        "grpc_port": config.QDRANT_GRPC_PORT,
+        "grpc_options": {"grpc.keepalive_time_ms": 30000},
+        "timeout": config.QDRANT_TIMEOUT,
+    }
+
+
+# Process-wide memo of query text -> embedding, most recently used last
+_EMBED_CACHE: "OrderedDict[str, Tuple[float, ...]]" = OrderedDict()
+_EMBED_CACHE_SIZE = 4096
+_EMBED_CACHE_LOCK = threading.Lock()
+
+
+def _embed(text: str) -> Tuple[float, ...]:
+    """Embedding of one text, computed at most once per process"""
+    return _embed_many([text])[0]
+
+
+def _embed_many(texts: List[str]) -> List[Tuple[float, ...]]:
+    """
+    Embeddings for `texts` in input order.
+    
+    Cached texts are answered from the memo; the rest are encoded together
+    in a single model call. Vectors are tuples so shared entries can't be
+    mutated by callers.
+    """
+    found = {}
+    with _EMBED_CACHE_LOCK:
+        for text in texts:
+            vector = _EMBED_CACHE.get(text)
+            if vector is not None:
+                _EMBED_CACHE.move_to_end(text)
+                found[text] = vector
+    
+    # Model runs unlocked so concurrent searches can overlap
+    uncached = [text for text in dict.fromkeys(texts) if text not in found]
+    if uncached:
+        vectors = get_embeddings().embed_documents(uncached)
+        with _EMBED_CACHE_LOCK:
+            for text, vector in zip(uncached, vectors):
+                found[text] = _EMBED_CACHE[text] = tuple(vector)
+            while len(_EMBED_CACHE) > _EMBED_CACHE_SIZE:
+                _EMBED_CACHE.popitem(last=False)
+    
+    return [found[text] for text in texts]
+
+
+class _LazyDict(Mapping):
+    """
+    Read-only mapping over a stored JSON document, parsed on first access.
+    
+    `extra` keys (e.g. "source") are answered without parsing, so callers
+    that only look at IDs/scores never pay for the JSON decode.
+    """
+    
+    __slots__ = ("_raw", "_extra", "_parsed")
+    
+    def __init__(self, raw: Optional[str], extra: Optional[Dict] = None):
+        self._raw = raw
+        self._extra = extra or {}
+        self._parsed = None
+    
+    def _data(self) -> Dict:
+        if self._parsed is None:
+            # Missing content is the common case; skip the decoder for it
+            parsed = {}
+            if self._raw:
+                try:
+                    parsed = orjson.loads(self._raw)
+                except orjson.JSONDecodeError:
+                    pass
+            parsed.update(self._extra)
+            self._parsed = parsed
+        return self._parsed
+    
+    def __getitem__(self, key):
+        if key in self._extra:
+            return self._extra[key]
+        return self._data()[key]
+    
+    def __iter__(self):
+        return iter(self._data())
+    
+    def __len__(self):
+        return len(self._data())
+    
+    def __repr__(self):
+        return f"_LazyDict({self._data()!r})"
 
 
 class RAGTools:
     """RAG tools using LangChain with Qdrant vector store"""
     
-    def __init__(self):
-        """Initialize RAG tools with embeddings and vector store"""
+    def __init__(self, quantize: Optional[bool] = None):
+        """
+        Initialize RAG tools with embeddings and vector store
+        
+        Args:
+            quantize: Search with int8 scalar quantization, enabling it on the
+                      collection if needed (defaults to QDRANT_QUANTIZATION)
+        """
+        if quantize is None:
+            quantize = config.QDRANT_QUANTIZATION
         
         # Initialize embeddings - MUST match indexing!
-        self.embeddings = HuggingFaceEmbeddings(
-            model_name=f"sentence-transformers/{config.EMBEDDING_MODEL_NAME}",
-            model_kwargs={"device": "cpu"},
-            encode_kwargs={"normalize_embeddings": True},
-        )
+        self.embeddings = get_embeddings()
 
-        # Initialize Qdrant client
-        self.client = QdrantClient(
-            url=config.QDRANT_URL,
-            api_key=config.QDRANT_API_KEY,
-        )
+        # Initialize Qdrant client (gRPC on port 6334 unless disabled)
+        self.client = QdrantClient(**_qdrant_client_kwargs())
 
-        # Initialize LangChain vector store wrapper
-        self.vector_store = QdrantVectorStore.from_existing_collection(
+        # Initialize LangChain vector store wrapper on the same client,
+        # so there is a single connection pool to Qdrant
+        self.vector_store = QdrantVectorStore(
+            client=self.client,
+            collection_name=config.QDRANT_COLLECTION_NAME,
             embedding=self.embeddings,
+            content_payload_key="page_content",
+            metadata_payload_key="metadata",
+        )
+        
+        # One collection lookup shared by the startup checks
+        collection_info = self.client.get_collection(config.QDRANT_COLLECTION_NAME)
+        self._ensure_payload_indexes(collection_info)
+        if quantize:
+            self._ensure_quantization(collection_info)
+        
+        # Local membership test so lookups of unknown IDs skip Qdrant;
+        # re-checked in the background every QUERY_CACHE_TTL (see _id_filter)
+        self._known_ids_count = collection_info.points_count or 0
+        self._known_ids = self._build_id_filter(self._known_ids_count)
+        self._known_ids_checked = time.monotonic()
+        self._known_ids_lock = threading.Lock()
+        
+        # IDs notified while a background rebuild runs; None when idle
+        self._pending_ids: Optional[List[str]] = None
+        
+        # HNSW beam width plus int8 scoring with full-precision rescoring
+        self._search_params = SearchParams(
+            hnsw_ef=config.QDRANT_HNSW_EF,
+            exact=False,
+            quantization=QuantizationSearchParams(
+                ignore=not quantize,
+                rescore=True,
+                oversampling=config.QDRANT_OVERSAMPLING,
+            ),
+        )
+        
+        # Result cache (exact + semantic)
+        self._query_cache = QueryCache(
+            max_size=config.QUERY_CACHE_SIZE,
+            ttl_seconds=config.QUERY_CACHE_TTL,
+            threshold=config.SEMANTIC_CACHE_THRESHOLD,
+        )
+        
+        # document_id -> (cache version, stored at, metadata) for ID lookups;
+        # shares the result cache's version, so writes invalidate both
+        self._retrieve_cache: Dict[str, Tuple[int, float, Dict]] = {}
+        self._retrieve_lock = threading.Lock()
+        
+        # (fetched at, stats); refetched after QUERY_CACHE_TTL, since
+        # writes from other processes never reach notify_new_ids
+        self._stats_cache: Optional[Tuple[float, Dict]] = None
+        
+        # Long-lived workers for search_all, sharing the sync client's channel
+        self._search_pool = ThreadPoolExecutor(max_workers=3, thread_name_prefix="rag-search")
+        
+        # Async clients, one per event loop (gRPC channels are loop-bound)
+        self._aclients: "WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncQdrantClient]" = WeakKeyDictionary()
+
+    def _ensure_payload_indexes(self, collection_info):
+        """Create keyword payload indexes for filtered fields (idempotent)"""
+        existing = collection_info.payload_schema or {}
+        
+        for field in PAYLOAD_INDEX_FIELDS:
+            if field in existing:
+                continue
+            try:
+                self.client.create_payload_index(
+                    collection_name=config.QDRANT_COLLECTION_NAME,
+                    field_name=field,
+                    field_schema=PayloadSchemaType.KEYWORD,
+                )
+            except (UnexpectedResponse, grpc.RpcError):
+                # Created concurrently by another process (REST or gRPC error)
+                pass
+
+    def _ensure_quantization(self, collection_info):
+        """Enable int8 scalar quantization on the collection if it is not set"""
+        if collection_info.config.quantization_config is not None:
+            return
+        
+        self.client.update_collection(
             collection_name=config.QDRANT_COLLECTION_NAME,
-            url=config.QDRANT_URL,
-            api_key=config.QDRANT_API_KEY,
+            quantization_config=INT8_QUANTIZATION,
         )
 
-    def _format_result(self, doc, score: float) -> Dict:
-        """Format a search result"""
+    def _build_id_filter(self, points_count: int) -> BloomFilter:
+        """Bloom filter over every stored document ID (payload-only scroll)"""
+        known_ids = BloomFilter(capacity=points_count)
+        
+        offset = None
+        while True:
+            page, offset = self.client.scroll(
+                collection_name=config.QDRANT_COLLECTION_NAME,
+                limit=1000,
+                offset=offset,
+                with_payload=["metadata.document_id"],
+                with_vectors=False,
+            )
+            known_ids.update(
+                point.payload.get('metadata', {}).get('document_id', '')
+                for point in page
+            )
+            if offset is None:
+                return known_ids
+
+    def _id_filter(self) -> BloomFilter:
+        """
+        The known-ID filter, refreshed in the background when stale.
+        
+        index_data.py writes from another process and cannot call
+        notify_new_ids, so a filter kept for the life of the process would
+        reject documents indexed after startup. Lookups never wait for the
+        refresh; they use the current filter until the new one is swapped in.
+        """
+        with self._known_ids_lock:
+            if (
+                self._pending_ids is None
+                and time.monotonic() - self._known_ids_checked > config.QUERY_CACHE_TTL
+            ):
+                self._known_ids_checked = time.monotonic()
+                self._pending_ids = []
+                threading.Thread(target=self._refresh_id_filter, daemon=True).start()
+            return self._known_ids
+
+    def _refresh_id_filter(self):
+        """Rebuild the known-ID filter if the collection's point count changed"""
+        known_ids = None
         try:
-            content = json.loads(doc.metadata.get('content', '{}'))
-        except:
-            content = {}
+            points_count = self.client.get_collection(config.QDRANT_COLLECTION_NAME).points_count or 0
+            if points_count != self._known_ids_count:
+                known_ids = self._build_id_filter(points_count)
+        finally:
+            with self._known_ids_lock:
+                if known_ids is not None:
+                    # Keep IDs notified while the scroll was running
+                    known_ids.update(self._pending_ids)
+                    self._known_ids = known_ids
+                    self._known_ids_count = points_count
+                self._pending_ids = None
+
+    def notify_new_ids(self, ids: List[str]):
+        """Register IDs written to the collection after startup"""
+        with self._known_ids_lock:
+            self._known_ids.update(ids)
+            if self._pending_ids is not None:
+                self._pending_ids.extend(ids)
         
-        # Extract ID from metadata
-        doc_id = doc.metadata.get('document_id', 'unknown')
+        # Cached searches may now be missing these documents
+        self._query_cache.invalidate()
+        self._stats_cache = None
+        with self._retrieve_lock:
+            self._retrieve_cache.clear()
+
+    def _format_result(self, metadata: Dict, score: float) -> Artifact:
+        """Build an Artifact from a stored metadata payload"""
+        document_type = metadata.get('document_type', 'unknown')
         
-        return {
-            "id": doc_id,
-            "score": float(score),
-            "document_type": doc.metadata.get('document_type', 'unknown'),
-            "module": doc.metadata.get('module', ''),
-            "metadata": content
-        }
+        # Source follows from the stored document type; the stored document
+        # itself is only decoded if a caller reads its fields
+        source = SOURCE_FOR_TYPE.get(document_type)
+        content = _LazyDict(
+            metadata.get('content'),
+            {"source": source} if source else None
+        )
+        
+        return Artifact(
+            id=metadata.get('document_id', 'unknown'),
+            score=score,
+            document_type=document_type,
+            module=metadata.get('module', ''),
+            metadata=content,
+        )
 
-    def search_stories(
+    def _embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """Embed queries through the shared memo; lists for Qdrant's request models"""
+        return [list(vector) for vector in _embed_many(queries)]
+
+    @staticmethod
+    def _build_filter(
+        document_type: str,
+        module: Optional[str] = None,
+        exclude_ids: Optional[Set[str]] = None
+    ) -> Filter:
+        """Server-side filter on document type, optional module and IDs to skip"""
+        must = [FieldCondition(key="metadata.document_type", match=MatchValue(value=document_type))]
+        if module:
+            must.append(FieldCondition(key="metadata.module", match=MatchValue(value=module)))
+        
+        # Already-collected IDs are pruned by Qdrant, so only new
+        # artifacts come back over the wire
+        must_not = None
+        if exclude_ids:
+            must_not = [FieldCondition(key="metadata.document_id", match=MatchAny(any=list(exclude_ids)))]
+        
+        return Filter(must=must, must_not=must_not)
+
+    def _scroll_by_ids(
+        self,
+        ids: List[str],
+        document_type: Optional[str] = None,
+        with_payload=True
+    ) -> List:
+        """Fetch the points whose metadata.document_id is in `ids` in one scroll"""
+        must = [FieldCondition(key="metadata.document_id", match=MatchAny(any=list(ids)))]
+        if document_type:
+            must.append(FieldCondition(key="metadata.document_type", match=MatchValue(value=document_type)))
+        
+        scroll_filter = Filter(must=must)
+        
+        points = []
+        unresolved = set(ids)
+        offset = None
+        while True:
+            page, offset = self.client.scroll(
+                collection_name=config.QDRANT_COLLECTION_NAME,
+                scroll_filter=scroll_filter,
+                limit=len(ids),
+                offset=offset,
+                with_payload=with_payload,
+                with_vectors=False,
+            )
+            points.extend(page)
+            
+            # Follow next_page_offset until the collection is exhausted or
+            # every requested ID has been seen (duplicate chunks of an ID
+            # can push matches past the first page)
+            unresolved.difference_update(
+                (point.payload or {}).get('metadata', {}).get('document_id') for point in page
+            )
+            if offset is None or not unresolved:
+                return points
+
+    @staticmethod
+    def _search_spec(
+        source: str,
+        module: Optional[str],
+        top_k: Optional[int],
+        exclude_ids: Optional[Set[str]]
+    ) -> Tuple:
+        """Query-cache spec: (document_type, module, top_k, exclude_ids)"""
+        return (
+            SOURCE_DOC_TYPES[source],
+            module,
+            top_k or config.SEARCH_TOP_K,
+            tuple(sorted(exclude_ids or ())),
+        )
+
+    def _cache_lookup(self, spec: Tuple, query: str) -> Tuple[Optional[List[Tuple]], Optional[List[float]]]:
+        """
+        Exact, then semantic query-cache lookup.
+        
+        Returns (cached (metadata, score) pairs or None, query vector). The
+        vector is None on an exact hit, which skips embedding the query.
+        Raw pairs are cached; every caller formats its own copies, so
+        cached hits are never shared mutable dicts.
+        """
+        docs_with_scores = self._query_cache.get(spec, query)
+        if docs_with_scores is not None:
+            return docs_with_scores, None
+        
+        vector = list(_embed(query))
+        return self._query_cache.get_similar(spec, vector), vector
+
+    def _search_by_vector(self, spec: Tuple, query: str, vector: List[float]) -> List[Tuple]:
+        """Filtered vector search for a cache miss; the results are cached"""
+        document_type, module, top_k, exclude_ids = spec
+        
+        # Qdrant applies the filter during HNSW traversal, so exactly
+        # top_k matching documents come back. Queried directly: the
+        # LangChain wrapper re-fetches the collection config on every call
+        response = self.client.query_points(
+            collection_name=config.QDRANT_COLLECTION_NAME,
+            query=vector,
+            query_filter=self._build_filter(document_type, module, exclude_ids),
+            limit=top_k,
+            search_params=self._search_params,
+            with_payload=True,
+        )
+        docs_with_scores = [
+            (point.payload.get('metadata', {}), point.score)
+            for point in response.points
+        ]
+        
+        # Only fresh results are stored: re-storing a semantic hit would
+        # restart its TTL and let stale results outlive it
+        self._query_cache.put(spec, query, vector, docs_with_scores)
+        return docs_with_scores
+
+    async def _asearch_by_vector(self, spec: Tuple, query: str, vector: List[float]) -> List[Tuple]:
+        """Async counterpart of _search_by_vector"""
+        document_type, module, top_k, exclude_ids = spec
+        
+        response = await self.aclient.query_points(
+            collection_name=config.QDRANT_COLLECTION_NAME,
+            query=vector,
+            query_filter=self._build_filter(document_type, module, exclude_ids),
+            limit=top_k,
+            search_params=self._search_params,
+            with_payload=True,
+        )
+        docs_with_scores = [
+            (point.payload.get('metadata', {}), point.score)
+            for point in response.points
+        ]
+        
+        self._query_cache.put(spec, query, vector, docs_with_scores)
+        return docs_with_scores
+
+    @property
+    def aclient(self) -> AsyncQdrantClient:
+        """Async Qdrant client bound to the running event loop"""
+        loop = asyncio.get_running_loop()
+        client = self._aclients.get(loop)
+        if client is None:
+            client = self._aclients[loop] = AsyncQdrantClient(**_qdrant_client_kwargs())
+        return client
+
+    async def _asearch(
+        self,
+        *,
+        source: str,
+        query: str,
+        module: Optional[str],
+        top_k: Optional[int],
+        exclude_ids: Optional[Set[str]] = None
+    ) -> List[Artifact]:
+        """Async counterpart of _search"""
+        spec = self._search_spec(source, module, top_k, exclude_ids)
+        
+        # Embedding may run the model or hit the on-disk cache; keep both
+        # off the event loop thread
+        docs_with_scores, vector = await asyncio.to_thread(self._cache_lookup, spec, query)
+        if docs_with_scores is None:
+            docs_with_scores = await self._asearch_by_vector(spec, query, vector)
+        
+        return [self._format_result(metadata, score) for metadata, score in docs_with_scores]
+
+    async def asearch_stories(
+        self,
+        query: str,
+        module: Optional[str] = None,
+        top_k: Optional[int] = None,
+        exclude_ids: Optional[Set[str]] = None
+    ) -> List[Artifact]:
+        """Search for JIRA user stories without blocking the event loop"""
+        return await self._asearch(
+            source="JIRA", query=query, module=module, top_k=top_k, exclude_ids=exclude_ids
+        )
+
+    async def asearch_documentation(
+        self,
+        query: str,
+        module: Optional[str] = None,
+        top_k: Optional[int] = None,
+        exclude_ids: Optional[Set[str]] = None
+    ) -> List[Artifact]:
+        """Search for Confluence documentation without blocking the event loop"""
+        return await self._asearch(
+            source="Confluence", query=query, module=module, top_k=top_k, exclude_ids=exclude_ids
+        )
+
+    async def asearch_test_cases(
+        self,
+        query: str,
+        module: Optional[str] = None,
+        top_k: Optional[int] = None,
+        exclude_ids: Optional[Set[str]] = None
+    ) -> List[Artifact]:
+        """Search for Zephyr test cases without blocking the event loop"""
+        return await self._asearch(
+            source="Zephyr", query=query, module=module, top_k=top_k, exclude_ids=exclude_ids
+        )
+
+    def search_all(
         self,
         query: str,
         module: Optional[str] = None,
         top_k: Optional[int] = None
-    ) -> List[Dict]:
-        """Search for JIRA user stories"""
-        top_k = top_k or config.SEARCH_TOP_K
+    ) -> Tuple[List[Artifact], List[Artifact], List[Artifact]]:
+        """
+        Search stories, documentation and test cases concurrently.
         
-        # NO FILTER - LangChain will search all, we filter in Python
-        # This is the most compatible approach
-        docs_with_scores = self.vector_store.similarity_search_with_score(
-            query=query,
-            k=top_k * 3  # Get more results to filter
-        )
+        Wall-clock time is the slowest of the three Qdrant round-trips
+        rather than their sum. The searches run on a persistent thread
+        pool over the shared sync client, so no connection is set up per
+        call; from async code, await the asearch_* methods instead.
         
-        # Filter in Python
-        results = []
-        for doc, score in docs_with_scores:
-            # Check document type
-            if doc.metadata.get('document_type') != 'jira_story':
-                continue
-            
-            # Check module if specified
-            if module and doc.metadata.get('module') != module:
-                continue
-            
-            result = self._format_result(doc, score)
-            result["metadata"]["source"] = "JIRA"
-            results.append(result)
-            
-            if len(results) >= top_k:
-                break
+        Returns:
+            (stories, documentation, test_cases)
+        """
+        # Embed once up front; the three searches then hit the memo
+        _embed(query)
+        
+        futures = [
+            self._search_pool.submit(
+                self._search, source=source, query=query, module=module, top_k=top_k
+            )
+            for source in ("JIRA", "Confluence", "Zephyr")
+        ]
+        return tuple(future.result() for future in futures)
+
+    def _iter_search(
+        self,
+        *,
+        source: str,
+        query: str,
+        module: Optional[str],
+        top_k: Optional[int],
+        exclude_ids: Optional[Set[str]] = None
+    ) -> Iterator[Artifact]:
+        """Shared search body for every source type, yielding hits lazily"""
+        spec = self._search_spec(source, module, top_k, exclude_ids)
+        
+        docs_with_scores, vector = self._cache_lookup(spec, query)
+        if docs_with_scores is None:
+            docs_with_scores = self._search_by_vector(spec, query, vector)
         
-        return results
+        for metadata, score in docs_with_scores:
+            yield self._format_result(metadata, score)
+
+    def _search(self, **kwargs) -> List[Artifact]:
+        """Materialized form of _iter_search"""
+        return list(self._iter_search(**kwargs))
+
+    def search_stories(
+        self,
+        query: str,
+        module: Optional[str] = None,
+        top_k: Optional[int] = None,
+        exclude_ids: Optional[Set[str]] = None
+    ) -> List[Artifact]:
+        """Search for JIRA user stories"""
+        return self._search(
+            source="JIRA", query=query, module=module, top_k=top_k, exclude_ids=exclude_ids
+        )
 
     def search_documentation(
         self,
         query: str,
         module: Optional[str] = None,
-        top_k: Optional[int] = None
-    ) -> List[Dict]:
+        top_k: Optional[int] = None,
+        exclude_ids: Optional[Set[str]] = None
+    ) -> List[Artifact]:
         """Search for Confluence documentation"""
-        top_k = top_k or config.SEARCH_TOP_K
-        
-        # Get more results and filter in Python
-        docs_with_scores = self.vector_store.similarity_search_with_score(
-            query=query,
-            k=top_k * 3
+        return self._search(
+            source="Confluence", query=query, module=module, top_k=top_k, exclude_ids=exclude_ids
         )
-        
-        results = []
-        for doc, score in docs_with_scores:
-            if doc.metadata.get('document_type') != 'confluence_doc':
-                continue
-            
-            if module and doc.metadata.get('module') != module:
-                continue
-            
-            result = self._format_result(doc, score)
-            result["metadata"]["source"] = "Confluence"
-            results.append(result)
-            
-            if len(results) >= top_k:
-                break
-        
-        return results
 
     def search_test_cases(
         self,
         query: str,
         module: Optional[str] = None,
-        top_k: Optional[int] = None
-    ) -> List[Dict]:
+        top_k: Optional[int] = None,
+        exclude_ids: Optional[Set[str]] = None
+    ) -> List[Artifact]:
         """Search for Zephyr test cases"""
-        top_k = top_k or config.SEARCH_TOP_K
-        
-        # Get more results and filter in Python
-        docs_with_scores = self.vector_store.similarity_search_with_score(
-            query=query,
-            k=top_k * 3
+        return self._search(
+            source="Zephyr", query=query, module=module, top_k=top_k, exclude_ids=exclude_ids
         )
+
+    def search_stories_iter(
+        self,
+        query: str,
+        module: Optional[str] = None,
+        top_k: Optional[int] = None,
+        exclude_ids: Optional[Set[str]] = None
+    ) -> Iterator[Artifact]:
+        """Lazily yield JIRA user stories; stop iterating to skip the rest"""
+        return self._iter_search(
+            source="JIRA", query=query, module=module, top_k=top_k, exclude_ids=exclude_ids
+        )
+
+    def search_documentation_iter(
+        self,
+        query: str,
+        module: Optional[str] = None,
+        top_k: Optional[int] = None,
+        exclude_ids: Optional[Set[str]] = None
+    ) -> Iterator[Artifact]:
+        """Lazily yield Confluence documentation; stop iterating to skip the rest"""
+        return self._iter_search(
+            source="Confluence", query=query, module=module, top_k=top_k, exclude_ids=exclude_ids
+        )
+
+    def search_test_cases_iter(
+        self,
+        query: str,
+        module: Optional[str] = None,
+        top_k: Optional[int] = None,
+        exclude_ids: Optional[Set[str]] = None
+    ) -> Iterator[Artifact]:
+        """Lazily yield Zephyr test cases; stop iterating to skip the rest"""
+        return self._iter_search(
+            source="Zephyr", query=query, module=module, top_k=top_k, exclude_ids=exclude_ids
+        )
+
+    def batch_search(
+        self,
+        specs: List[Tuple[str, str, Optional[str], Optional[int]]]
+    ) -> List[List[Artifact]]:
+        """
+        Run several searches with a single batched embedding pass and
+        one batched Qdrant request for the cache misses.
         
-        results = []
-        for doc, score in docs_with_scores:
-            if doc.metadata.get('document_type') != 'test_case':
-                continue
-            
-            if module and doc.metadata.get('module') != module:
-                continue
-            
-            result = self._format_result(doc, score)
-            result["metadata"]["source"] = "Zephyr"
-            results.append(result)
+        Args:
+            specs: (query, source, module, top_k) tuples; source is one of
+                   "JIRA", "Confluence", "Zephyr"
             
-            if len(results) >= top_k:
-                break
+        Returns:
+            One result list per spec, in input order
+        """
+        queries = [query for query, _, _, _ in specs]
+        cache_specs = [
+            self._search_spec(source, module, top_k, None)
+            for _, source, module, top_k in specs
+        ]
         
-        return results
+        hits = [self._query_cache.get(spec, query) for spec, query in zip(cache_specs, queries)]
+        
+        # Embed every exact-cache miss in one model call
+        missing = [i for i, docs in enumerate(hits) if docs is None]
+        vectors = dict(zip(missing, self._embed_queries([queries[i] for i in missing]))) if missing else {}
+        for i in missing:
+            hits[i] = self._query_cache.get_similar(cache_specs[i], vectors[i])
+        
+        # Everything still missing goes to Qdrant in one batched request
+        to_query = [i for i in missing if hits[i] is None]
+        if to_query:
+            responses = self.client.query_batch_points(
+                collection_name=config.QDRANT_COLLECTION_NAME,
+                requests=[
+                    QueryRequest(
+                        query=vectors[i],
+                        filter=self._build_filter(cache_specs[i][0], cache_specs[i][1]),
+                        limit=cache_specs[i][2],
+                        params=self._search_params,
+                        with_payload=True,
+                    )
+                    for i in to_query
+                ],
+            )
+            for i, response in zip(to_query, responses):
+                hits[i] = [(point.payload.get('metadata', {}), point.score) for point in response.points]
+                self._query_cache.put(cache_specs[i], queries[i], vectors[i], hits[i])
+        
+        return [
+            [self._format_result(metadata, score) for metadata, score in docs_with_scores]
+            for docs_with_scores in hits
+        ]
+
+    def multi_search(
+        self,
+        queries: List[Tuple[str, str, Optional[str]]],
+        top_k: Optional[int] = None
+    ) -> List[List[Artifact]]:
+        """batch_search with one top_k shared by every (query, source, module)"""
+        return self.batch_search([
+            (query, source, module, top_k) for query, source, module in queries
+        ])
+
+    def _linked_test_points(self, story_ids: List[str], with_payload=True) -> List:
+        """Every test case whose metadata.linked_stories hits `story_ids`, in one paginated scroll"""
+        scroll_filter = Filter(must=[
+            FieldCondition(key="metadata.linked_stories", match=MatchAny(any=list(story_ids))),
+            FieldCondition(key="metadata.document_type", match=MatchValue(value=SOURCE_DOC_TYPES["Zephyr"])),
+        ])
+        
+        points = []
+        offset = None
+        while True:
+            page, offset = self.client.scroll(
+                collection_name=config.QDRANT_COLLECTION_NAME,
+                scroll_filter=scroll_filter,
+                limit=1000,
+                offset=offset,
+                with_payload=with_payload,
+                with_vectors=False,
+            )
+            points.extend(page)
+            if offset is None:
+                return points
+
+    @staticmethod
+    def _bucket_by_story(points: List, story_ids: List[str]) -> Dict[str, List[str]]:
+        """story ID -> IDs of the test points that link to it"""
+        wanted = set(story_ids)
+        story_test_map = defaultdict(list)
+        for point in points:
+            metadata = point.payload.get('metadata', {})
+            for story_id in metadata.get('linked_stories', []):
+                if story_id in wanted:
+                    story_test_map[story_id].append(metadata.get('document_id'))
+        
+        # State schema expects a plain dict; unknown stories map to []
+        return {story_id: story_test_map.get(story_id, []) for story_id in story_ids}
+
+    def _story_side_links(self, story_ids: List[str]) -> Dict[str, List[str]]:
+        """Links read from each story's linked_issues.tested_by"""
+        # Repeated story IDs accumulate their links instead of overwriting
+        story_test_map = defaultdict(list)
+        
+        for story in self.batch_retrieve_by_ids(story_ids, source="JIRA"):
+            linked_issues = story.metadata.get('linked_issues', {})
+            story_test_map[story.id].extend(linked_issues.get('tested_by', []))
+        
+        return {story_id: story_test_map.get(story_id, []) for story_id in story_ids}
+
+    @staticmethod
+    def _merge_links(*maps: Dict[str, List[str]]) -> Dict[str, List[str]]:
+        """Union of story -> test maps, keeping first-seen order and dropping repeats"""
+        merged = {}
+        for story_test_map in maps:
+            for story_id, test_ids in story_test_map.items():
+                merged.setdefault(story_id, []).extend(test_ids)
+        return {story_id: list(dict.fromkeys(test_ids)) for story_id, test_ids in merged.items()}
 
     def find_test_cases_by_stories(self, story_ids: List[str]) -> Dict[str, List[str]]:
-        """Find linked test cases for given stories"""
+        """
+        Find linked test cases for given stories.
         
-        story_test_map = {}
+        Links are the union of both directions: each story's
+        linked_issues.tested_by (listed first) plus every test case whose
+        linked_stories names the story.
+        """
+        if not story_ids:
+            return {}
         
-        for story_id in story_ids:
-            # Search for the story
-            docs = self.vector_store.similarity_search(
-                query=story_id,
-                k=20  # Get more to find the exact one
-            )
-            
-            # Find the matching story by ID
-            for doc in docs:
-                if (doc.metadata.get('document_type') == 'jira_story' and 
-                    doc.metadata.get('document_id') == story_id):
-                    try:
-                        content = json.loads(doc.metadata.get('content', '{}'))
-                        linked_issues = content.get('linked_issues', {})
-                        tested_by = linked_issues.get('tested_by', [])
-                        story_test_map[story_id] = tested_by
-                        break
-                    except:
-                        story_test_map[story_id] = []
-            
-            if story_id not in story_test_map:
-                story_test_map[story_id] = []
+        # One filtered scroll over the tests, whatever the number of stories;
+        # only the two fields needed for bucketing come back
+        points = self._linked_test_points(
+            story_ids, with_payload=["metadata.document_id", "metadata.linked_stories"]
+        )
+        
+        return self._merge_links(
+            self._story_side_links(story_ids),
+            self._bucket_by_story(points, story_ids),
+        )
+
+    def fetch_stories_with_tests(
+        self,
+        story_ids: List[str]
+    ) -> Tuple[Dict[str, List[str]], List[Artifact]]:
+        """
+        Resolve story -> test links (see find_test_cases_by_stories) and
+        fetch the linked test cases.
+        
+        The test-side scroll returns full payloads, so only tests linked
+        from the story side alone need a second lookup by ID.
+        """
+        if not story_ids:
+            return {}, []
+        
+        points = self._linked_test_points(story_ids)
+        story_test_map = self._merge_links(
+            self._story_side_links(story_ids),
+            self._bucket_by_story(points, story_ids),
+        )
+        
+        # Unique test IDs, first-seen order
+        test_ids = list(dict.fromkeys(
+            test_id for tests in story_test_map.values() for test_id in tests
+        ))
+        
+        tests_by_id = {}
+        for point in points:
+            metadata = point.payload.get('metadata', {})
+            tests_by_id.setdefault(metadata.get('document_id'), self._format_result(metadata, 1.0))
+        
+        missing = [test_id for test_id in test_ids if test_id not in tests_by_id]
+        for test in self.batch_retrieve_by_ids(missing, source="Zephyr"):
+            tests_by_id.setdefault(test.id, test)
         
-        return story_test_map
+        test_cases = [tests_by_id[test_id] for test_id in test_ids if test_id in tests_by_id]
+        return story_test_map, test_cases
+
+    def _fetch_by_ids(self, ids: List[str], document_type: Optional[str]) -> Dict[str, Dict]:
+        """document_id -> stored metadata for every ID found in Qdrant"""
+        # Points are stored under uuid5(document_id), so one retrieve call
+        # fetches them all without touching the payload index
+        points = self.client.retrieve(
+            collection_name=config.QDRANT_COLLECTION_NAME,
+            ids=[point_id(doc_id) for doc_id in ids],
+            with_payload=True,
+            with_vectors=False,
+        )
+        
+        by_id = {}
+        for point in points:
+            metadata = point.payload.get('metadata', {})
+            by_id.setdefault(metadata.get('document_id'), metadata)
+        
+        # Collections indexed before deterministic IDs: filter-scroll the rest
+        missing = [doc_id for doc_id in ids if doc_id not in by_id]
+        if missing:
+            for point in self._scroll_by_ids(missing, document_type=document_type):
+                metadata = point.payload.get('metadata', {})
+                by_id.setdefault(metadata.get('document_id'), metadata)
+        
+        return by_id
 
     def batch_retrieve_by_ids(
         self,
         ids: List[str],
         source: Optional[str] = None
-    ) -> List[Dict]:
+    ) -> List[Artifact]:
         """Retrieve documents by exact IDs"""
+        # IDs the bloom filter has never seen cannot be in the collection
+        known_ids = self._id_filter()
+        ids = [doc_id for doc_id in ids if doc_id in known_ids]
+        if not ids:
+            return []
         
-        results = []
+        document_type = SOURCE_DOC_TYPES.get(source)
+        version = self._query_cache.version
+        now = time.monotonic()
         
-        # Map source to document type
-        doc_type_map = {
-            "JIRA": "jira_story",
-            "Confluence": "confluence_doc",
-            "Zephyr": "test_case"
-        }
+        # Documents fetched earlier in this run (and not since written to)
+        by_id = {}
+        with self._retrieve_lock:
+            for doc_id in ids:
+                entry = self._retrieve_cache.get(doc_id)
+                if entry and entry[0] == version and now - entry[1] <= config.QUERY_CACHE_TTL:
+                    by_id[doc_id] = entry[2]
         
-        for doc_id in ids:
-            # Do a broad search
-            docs = self.vector_store.similarity_search(
-                query=doc_id,
-                k=50  # Get many results
-            )
-            
-            # Find exact match
-            for doc in docs:
-                if doc.metadata.get('document_id') == doc_id:
-                    # Check source if specified
-                    if source:
-                        if doc.metadata.get('document_type') != doc_type_map.get(source):
-                            continue
-                    
-                    result = self._format_result(doc, 1.0)
-                    results.append(result)
-                    break
-        
-        return results
+        missing = [doc_id for doc_id in dict.fromkeys(ids) if doc_id not in by_id]
+        if missing:
+            fetched = self._fetch_by_ids(missing, document_type)
+            with self._retrieve_lock:
+                for doc_id, metadata in fetched.items():
+                    self._retrieve_cache[doc_id] = (version, now, metadata)
+                # Oldest insertions first
+                while len(self._retrieve_cache) > config.QUERY_CACHE_SIZE:
+                    del self._retrieve_cache[next(iter(self._retrieve_cache))]
+            by_id.update(fetched)
+        
+        # Re-emit in request order; unknown IDs and other sources are skipped
+        return [
+            self._format_result(by_id[doc_id], 1.0)
+            for doc_id in ids
+            if doc_id in by_id
+            and (document_type is None or by_id[doc_id].get('document_type') == document_type)
+        ]
+
+    def warmup(self):
+        """
+        Pay one-time startup costs up front: a forward pass through the
+        model (bypassing the embedding caches) and a Qdrant round-trip to
+        open the connection.
+        """
+        get_embeddings().underlying_embeddings.embed_documents(["warmup"])
+        self.client.get_collection(config.QDRANT_COLLECTION_NAME)
 
     def get_collection_stats(self) -> Dict:
-        """Get collection statistics"""
+        """Get collection statistics (cached for QUERY_CACHE_TTL or until the next write)"""
+        cached = self._stats_cache
+        now = time.monotonic()
+        if cached is None or now - cached[0] > config.QUERY_CACHE_TTL:
+            cached = self._stats_cache = (now, self._fetch_collection_stats())
+        return dict(cached[1])
+
+    def _fetch_collection_stats(self) -> Dict:
         collection_info = self.client.get_collection(config.QDRANT_COLLECTION_NAME)
         
         # Handle different vector config structures
@@ -249,26 +1030,105 @@ class RAGTools:
         }
 
 
-# Singleton instance
-rag_tools = RAGTools()
+def hits_to_soa(hits: List[Artifact]) -> Dict[str, np.ndarray]:
+    """
+    Column (structure-of-arrays) view of search hits.
+    
+    Aggregations such as counts per source or best score per module then
+    run as NumPy operations instead of Python loops over Artifacts.
+    """
+    return {
+        "id": np.array([hit.id for hit in hits], dtype=object),
+        "score": np.fromiter((hit.score for hit in hits), dtype=np.float32, count=len(hits)),
+        "source": np.array([hit.metadata.get('source') for hit in hits], dtype=object),
+        "module": np.array([hit.module for hit in hits], dtype=object),
+    }
+
+
+# Singleton instance, created on first use so importing this module does
+# not connect to Qdrant or load the embedding model
+_rag_tools: Optional[RAGTools] = None
+_rag_tools_lock = threading.Lock()
+
+
+def get_rag_tools() -> RAGTools:
+    """Return the shared RAGTools instance, creating it on first call"""
+    global _rag_tools
+    if _rag_tools is None:
+        # Threads racing on first use must not build two clients/models
+        with _rag_tools_lock:
+            if _rag_tools is None:
+                _rag_tools = RAGTools()
+    return _rag_tools
+
+
+def __getattr__(name: str):
+    # Keeps `from .rag_tools import rag_tools` working (PEP 562)
+    if name == "rag_tools":
+        return get_rag_tools()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # Convenience functions
-def search_stories(query: str, module: Optional[str] = None, top_k: Optional[int] = None) -> List[Dict]:
-    return rag_tools.search_stories(query, module, top_k)
+def search_stories(
+    query: str,
+    module: Optional[str] = None,
+    top_k: Optional[int] = None,
+    exclude_ids: Optional[Set[str]] = None
+) -> List[Artifact]:
+    return get_rag_tools().search_stories(query, module, top_k, exclude_ids)
+
+
+def search_documentation(
+    query: str,
+    module: Optional[str] = None,
+    top_k: Optional[int] = None,
+    exclude_ids: Optional[Set[str]] = None
+) -> List[Artifact]:
+    return get_rag_tools().search_documentation(query, module, top_k, exclude_ids)
+
 
+def search_test_cases(
+    query: str,
+    module: Optional[str] = None,
+    top_k: Optional[int] = None,
+    exclude_ids: Optional[Set[str]] = None
+) -> List[Artifact]:
+    return get_rag_tools().search_test_cases(query, module, top_k, exclude_ids)
 
-def search_documentation(query: str, module: Optional[str] = None, top_k: Optional[int] = None) -> List[Dict]:
-    return rag_tools.search_documentation(query, module, top_k)
 
+def search_all(
+    query: str,
+    module: Optional[str] = None,
+    top_k: Optional[int] = None
+) -> Tuple[List[Artifact], List[Artifact], List[Artifact]]:
+    return get_rag_tools().search_all(query, module, top_k)
 
-def search_test_cases(query: str, module: Optional[str] = None, top_k: Optional[int] = None) -> List[Dict]:
-    return rag_tools.search_test_cases(query, module, top_k)
+
+def batch_search(
+    specs: List[Tuple[str, str, Optional[str], Optional[int]]]
+) -> List[List[Artifact]]:
+    return get_rag_tools().batch_search(specs)
+
+
+def multi_search(
+    queries: List[Tuple[str, str, Optional[str]]],
+    top_k: Optional[int] = None
+) -> List[List[Artifact]]:
+    return get_rag_tools().multi_search(queries, top_k)
 
 
 def find_test_cases_by_stories(story_ids: List[str]) -> Dict[str, List[str]]:
-    return rag_tools.find_test_cases_by_stories(story_ids)
+    return get_rag_tools().find_test_cases_by_stories(story_ids)
+
+
+def fetch_stories_with_tests(story_ids: List[str]) -> Tuple[Dict[str, List[str]], List[Artifact]]:
+    return get_rag_tools().fetch_stories_with_tests(story_ids)
+
+
+def warmup():
+    get_rag_tools().warmup()
 
 
-def batch_retrieve_by_ids(ids: List[str], source: Optional[str] = None) -> List[Dict]:
-    return rag_tools.batch_retrieve_by_ids(ids, source)
\ No newline at end of file
+def batch_retrieve_by_ids(ids: List[str], source: Optional[str] = None) -> List[Artifact]:
+    return get_rag_tools().batch_retrieve_by_ids(ids, source)
\ No newline at end of file
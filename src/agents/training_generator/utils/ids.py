@@ -0,0 +1,17 @@
+"""
+Deterministic Qdrant point IDs
+
+Each document is stored under a UUID derived from its external ID
+(e.g. 'PAY-001', 'TC-PAY-001'), so lookups by ID can go straight to
+`client.retrieve` instead of filtering the payload.
+"""
+
+import uuid
+
+# Fixed namespace: changing it orphans every point already indexed
+_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "module_generator/document_id")
+
+
+def point_id(document_id: str) -> str:
+    """Qdrant point ID for an external document ID"""
+    return str(uuid.uuid5(_NAMESPACE, document_id))
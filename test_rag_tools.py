@@ -3,172 +3,178 @@ Test RAG Tools with Broader Queries
 """
 
 import sys
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from agents.training_generator.tools.rag_tools import (
-    search_stories,
-    search_documentation,
-    search_test_cases,
+    batch_search,
     find_test_cases_by_stories,
     batch_retrieve_by_ids,
+    hits_to_soa,
     rag_tools,
 )
 
-from rich.console import Console
+import numpy as np
+
+from rich.console import Console, Group
 from rich.panel import Panel
 from rich.table import Table
+from rich.text import Text
 
 console = Console()
 
+MODULES = ("Payment", "Inventory", "Search", "Authentication", "Order Management")
+_LETTERS = "abcdefghij"
 
-def _print_hits(label: str, items):
-    if not items:
-        console.print(f"  [dim]Found 0 {label}[/dim]")
-        return
-        
-    console.print(f"  [cyan]Found {len(items)} {label}[/cyan]")
+
+def _module_query(module: str) -> str:
+    # "Order Management" -> "order"
+    return module.split()[0].lower()
+
+
+def _render_hits(label: str, items) -> Table:
+    # One table per hit list; cells are plain strings, so no per-hit markup parsing
+    table = Table(
+        title=f"Found {len(items)} {label}",
+        title_style="cyan",
+        title_justify="left",
+        show_header=True,
+        header_style="bold magenta",
+    )
+    table.add_column("ID", style="bold")
+    table.add_column("Title")
+    table.add_column("Source", style="yellow")
+    table.add_column("Module")
+    table.add_column("Score", style="dim", justify="right")
+    
     for item in items:
-        meta = item["metadata"]
-        console.print(
-            f"    ✓ [bold]{item['id']}[/bold]: {meta.get('title', 'N/A')[:60]}... "
-            f"[dim](score: {item['score']:.3f})[/dim]"
+        meta = item.metadata
+        table.add_row(
+            item.id,
+            meta.get('title', '')[:60],
+            meta.get('source', ''),
+            item.module,
+            f"{item.score:.3f}",
         )
+    return table
+
+
+def _collect(hits, all_results: list, seen_ids: set, src_counts: Counter):
+    """Record hits for the summary in one pass: totals, unique IDs, per-source counts"""
+    all_results.extend(hits)
+    for item in hits:
+        seen_ids.add(item.id)
+        src_counts[item.metadata.get('source')] += 1
+
+
+def _render_source_section(
+    title: str,
+    section: str,
+    kind: str,
+    hits_by_module,
+    all_label: str,
+    all_hits,
+    all_results: list,
+    seen_ids: set,
+    src_counts: Counter,
+    lead: str = "\n\n"
+) -> Group:
+    """One test section (per-module hits + unfiltered hits) as a single renderable"""
+    items = [Text.from_markup(f"{lead}[yellow]━━━ {title} ━━━[/yellow]")]
+    empty = []
+    
+    # Empty hit lists get no heading or table and add nothing to the summary
+    for i, (module, hits) in enumerate(zip(MODULES, hits_by_module)):
+        if not hits:
+            empty.append(f"{section}{_LETTERS[i]}. {module}")
+            continue
+        items.append(Text.from_markup(f"\n  [bold]{section}{_LETTERS[i]}. {module}[/bold]"))
+        items.append(_render_hits(f"{_module_query(module)} {kind}", hits))
+        _collect(hits, all_results, seen_ids, src_counts)
+    
+    all_heading = f"{section}{_LETTERS[len(MODULES)]}. {all_label}"
+    if all_hits:
+        items.append(Text.from_markup(f"\n  [bold]{all_heading}[/bold]"))
+        items.append(_render_hits(f"all {kind}", all_hits))
+    else:
+        empty.append(all_heading)
+    
+    if empty:
+        items.append(Text(f"\n  No {kind} found for: {', '.join(empty)}", style="dim"))
+    return Group(*items)
 
 
 def test_rag_tools():
     """Test RAG with simpler, broader queries"""
 
-    console.print("\n[bold magenta]═══════════════════════════════════════[/bold magenta]")
-    console.print("[bold magenta]    Testing RAG Tools - Full Suite    [/bold magenta]")
-    console.print("[bold magenta]═══════════════════════════════════════[/bold magenta]\n")
+    console.print(Text.from_markup(
+        "\n[bold magenta]═══════════════════════════════════════[/bold magenta]\n"
+        "[bold magenta]    Testing RAG Tools - Full Suite    [/bold magenta]\n"
+        "[bold magenta]═══════════════════════════════════════[/bold magenta]\n"
+    ))
 
-    all_results = []
+    # Load the model and open the Qdrant connection before timing anything
+    rag_tools.warmup()
 
-    # ========================================================================
-    # Test 1: JIRA Stories (Broad Queries)
-    # ========================================================================
-    
-    console.print("[yellow]━━━ Test 1: JIRA User Stories ━━━[/yellow]\n")
-    
-    # 1a: Payment module
-    console.print("  [bold]1a. Payment Module[/bold]")
-    stories_payment = search_stories("payment", module="Payment", top_k=10)
-    _print_hits("payment stories", stories_payment)
-    all_results.extend(stories_payment)
-    
-    # 1b: Inventory module
-    console.print("\n  [bold]1b. Inventory Module[/bold]")
-    stories_inventory = search_stories("inventory", module="Inventory", top_k=10)
-    _print_hits("inventory stories", stories_inventory)
-    all_results.extend(stories_inventory)
-    
-    # 1c: Search module
-    console.print("\n  [bold]1c. Search Module[/bold]")
-    stories_search = search_stories("search", module="Search", top_k=10)
-    _print_hits("search stories", stories_search)
-    all_results.extend(stories_search)
-    
-    # 1d: Authentication
-    console.print("\n  [bold]1d. Authentication Module[/bold]")
-    stories_auth = search_stories("authentication", module="Authentication", top_k=10)
-    _print_hits("auth stories", stories_auth)
-    all_results.extend(stories_auth)
-    
-    # 1e: Order Management
-    console.print("\n  [bold]1e. Order Management Module[/bold]")
-    stories_order = search_stories("order", module="Order Management", top_k=10)
-    _print_hits("order stories", stories_order)
-    all_results.extend(stories_order)
-    
-    # 1f: All modules (no filter)
-    console.print("\n  [bold]1f. All Modules (No Filter)[/bold]")
-    stories_all = search_stories("user story", module=None, top_k=10)
-    _print_hits("all stories", stories_all)
+    all_results: list = []
+    seen_ids: set[str] = set()
+    src_counts = Counter()
 
     # ========================================================================
-    # Test 2: Confluence Documentation (Broad Queries)
+    # Tests 1-3: one batched request per source (every module + no filter)
     # ========================================================================
     
-    console.print("\n\n[yellow]━━━ Test 2: Confluence Documentation ━━━[/yellow]\n")
-    
-    # 2a: Payment docs
-    console.print("  [bold]2a. Payment Docs[/bold]")
-    docs_payment = search_documentation("payment", module="Payment", top_k=10)
-    _print_hits("payment docs", docs_payment)
-    all_results.extend(docs_payment)
-    
-    # 2b: Inventory docs
-    console.print("\n  [bold]2b. Inventory Docs[/bold]")
-    docs_inventory = search_documentation("inventory", module="Inventory", top_k=10)
-    _print_hits("inventory docs", docs_inventory)
-    all_results.extend(docs_inventory)
-    
-    # 2c: Search docs
-    console.print("\n  [bold]2c. Search Docs[/bold]")
-    docs_search = search_documentation("search", module="Search", top_k=10)
-    _print_hits("search docs", docs_search)
-    all_results.extend(docs_search)
-    
-    # 2d: Authentication docs
-    console.print("\n  [bold]2d. Authentication Docs[/bold]")
-    docs_auth = search_documentation("authentication", module="Authentication", top_k=10)
-    _print_hits("auth docs", docs_auth)
-    all_results.extend(docs_auth)
-    
-    # 2e: All docs (no filter)
-    console.print("\n  [bold]2e. All Docs (No Filter)[/bold]")
-    docs_all = search_documentation("documentation guide", module=None, top_k=10)
-    _print_hits("all docs", docs_all)
-
-    # ========================================================================
-    # Test 3: Zephyr Test Cases (Broad Queries)
-    # ========================================================================
-    
-    console.print("\n\n[yellow]━━━ Test 3: Zephyr Test Cases ━━━[/yellow]\n")
-    
-    # 3a: Payment tests
-    console.print("  [bold]3a. Payment Tests[/bold]")
-    tests_payment = search_test_cases("payment", module="Payment", top_k=10)
-    _print_hits("payment tests", tests_payment)
-    all_results.extend(tests_payment)
-    
-    # 3b: Inventory tests
-    console.print("\n  [bold]3b. Inventory Tests[/bold]")
-    tests_inventory = search_test_cases("inventory", module="Inventory", top_k=10)
-    _print_hits("inventory tests", tests_inventory)
-    all_results.extend(tests_inventory)
-    
-    # 3c: Search tests
-    console.print("\n  [bold]3c. Search Tests[/bold]")
-    tests_search = search_test_cases("search", module="Search", top_k=10)
-    _print_hits("search tests", tests_search)
-    all_results.extend(tests_search)
-    
-    # 3d: Authentication tests
-    console.print("\n  [bold]3d. Authentication Tests[/bold]")
-    tests_auth = search_test_cases("authentication", module="Authentication", top_k=10)
-    _print_hits("auth tests", tests_auth)
-    all_results.extend(tests_auth)
-    
-    # 3e: All tests (no filter)
-    console.print("\n  [bold]3e. All Tests (No Filter)[/bold]")
-    tests_all = search_test_cases("test verify", module=None, top_k=10)
-    _print_hits("all tests", tests_all)
+    batches = {
+        "JIRA": [(_module_query(m), "JIRA", m, 10) for m in MODULES]
+                + [("user story", "JIRA", None, 10)],
+        "Confluence": [(_module_query(m), "Confluence", m, 10) for m in MODULES]
+                      + [("documentation guide", "Confluence", None, 10)],
+        "Zephyr": [(_module_query(m), "Zephyr", m, 10) for m in MODULES]
+                  + [("test verify", "Zephyr", None, 10)],
+    }
+    
+    # The three batches are independent; overlap their Qdrant round-trips
+    # and print afterwards in a fixed order
+    with ThreadPoolExecutor(max_workers=len(batches)) as executor:
+        futures = {source: executor.submit(batch_search, specs) for source, specs in batches.items()}
+    results = {source: future.result() for source, future in futures.items()}
+    
+    *stories_by_module, stories_all = results["JIRA"]
+    console.print(_render_source_section(
+        "Test 1: JIRA User Stories", "1", "stories",
+        stories_by_module, "All Modules (No Filter)", stories_all,
+        all_results, seen_ids, src_counts, lead=""
+    ))
+    
+    *docs_by_module, docs_all = results["Confluence"]
+    console.print(_render_source_section(
+        "Test 2: Confluence Documentation", "2", "docs",
+        docs_by_module, "All Docs (No Filter)", docs_all,
+        all_results, seen_ids, src_counts
+    ))
+    
+    *tests_by_module, tests_all = results["Zephyr"]
+    console.print(_render_source_section(
+        "Test 3: Zephyr Test Cases", "3", "tests",
+        tests_by_module, "All Tests (No Filter)", tests_all,
+        all_results, seen_ids, src_counts
+    ))
 
     # ========================================================================
     # Test 4: Relationships
     # ========================================================================
     
-    console.print("\n\n[yellow]━━━ Test 4: Story-Test Relationships ━━━[/yellow]\n")
+    section = [Text.from_markup("\n\n[yellow]━━━ Test 4: Story-Test Relationships ━━━[/yellow]\n")]
     
-    all_stories = stories_payment + stories_inventory + stories_search + stories_auth + stories_order
+    all_stories = [story for hits in stories_by_module for story in hits]
     if all_stories:
         # Take up to 5 stories
-        story_ids = [s["id"] for s in all_stories[:5]]
-        console.print(f"  Looking up test cases for stories: [cyan]{story_ids}[/cyan]\n")
+        story_ids = [s.id for s in all_stories[:5]]
+        section.append(Text.from_markup(f"  Looking up test cases for stories: [cyan]{story_ids}[/cyan]\n"))
         
         relationships = find_test_cases_by_stories(story_ids)
         
@@ -182,23 +188,22 @@ def test_rag_tools():
             else:
                 table.add_row(story_id, "[dim]No linked tests[/dim]")
         
-        console.print(table)
+        section.append(table)
     else:
-        console.print("  [red]No stories found to test relationships[/red]")
+        section.append(Text.from_markup("  [red]No stories found to test relationships[/red]"))
+    
+    console.print(Group(*section))
 
     # ========================================================================
     # Test 5: Batch Retrieval
     # ========================================================================
     
-    console.print("\n\n[yellow]━━━ Test 5: Batch Retrieval by ID ━━━[/yellow]\n")
-    
     # Test with known IDs from various modules
     known_ids = [
         "TC-PAY-001", "TC-PAY-002", "TC-PAY-030",
         "TC-SRCH-020", "TC-INV-025", "TC-AUTH-020",
         "TC-ORD-050", "TC-NOTIF-030", "TC-USR-040"
     ]
-    console.print(f"  Attempting to retrieve {len(known_ids)} test cases by ID...\n")
     
     retrieved = batch_retrieve_by_ids(known_ids, source="Zephyr")
     
@@ -209,19 +214,22 @@ def test_rag_tools():
     
     for test in retrieved:
         table.add_row(
-            test['id'],
-            test['metadata'].get('title', 'N/A')[:50] + "...",
-            test['metadata'].get('module', 'N/A')
+            test.id,
+            test.metadata.get('title', 'N/A')[:50] + "...",
+            test.metadata.get('module', 'N/A')
         )
     
-    console.print(table)
-    console.print(f"\n  [green]✓ Successfully retrieved {len(retrieved)}/{len(known_ids)} test cases[/green]")
+    console.print(Group(
+        Text.from_markup("\n\n[yellow]━━━ Test 5: Batch Retrieval by ID ━━━[/yellow]\n"),
+        Text(f"  Attempting to retrieve {len(known_ids)} test cases by ID...\n"),
+        table,
+        Text.from_markup(f"\n  [green]✓ Successfully retrieved {len(retrieved)}/{len(known_ids)} test cases[/green]"),
+    ))
 
     # ========================================================================
-    # Collection Stats
+    # Collection Stats + Final Summary (rendered together, once)
     # ========================================================================
     
-    console.print("\n\n[yellow]━━━ Collection Statistics ━━━[/yellow]\n")
     stats = rag_tools.get_collection_stats()
     
     stats_panel = Panel(
@@ -233,44 +241,57 @@ def test_rag_tools():
         border_style="green",
         padding=(1, 2)
     )
-    console.print(stats_panel)
-
-    # ========================================================================
-    # Final Summary
-    # ========================================================================
-    
-    console.print("\n[yellow]━━━ Test Summary ━━━[/yellow]\n")
-    
-    # Count unique results
-    unique_ids = set(item['id'] for item in all_results)
     
     summary_table = Table(show_header=True, header_style="bold magenta")
     summary_table.add_column("Metric", style="cyan")
     summary_table.add_column("Count", style="green", justify="right")
     
-    summary_table.add_row("JIRA Stories Found", str(len([r for r in all_results if r['metadata'].get('source') == 'JIRA'])))
-    summary_table.add_row("Confluence Docs Found", str(len([r for r in all_results if r['metadata'].get('source') == 'Confluence'])))
-    summary_table.add_row("Zephyr Tests Found", str(len([r for r in all_results if r['metadata'].get('source') == 'Zephyr'])))
+    summary_table.add_row("JIRA Stories Found", str(src_counts['JIRA']))
+    summary_table.add_row("Confluence Docs Found", str(src_counts['Confluence']))
+    summary_table.add_row("Zephyr Tests Found", str(src_counts['Zephyr']))
     summary_table.add_row("Total Items Retrieved", str(len(all_results)))
-    summary_table.add_row("Unique Documents", str(len(unique_ids)))
+    summary_table.add_row("Unique Documents", str(len(seen_ids)))
     summary_table.add_row("Documents in Qdrant", str(stats['total_documents']))
     
-    console.print(summary_table)
+    # Best score per module, vectorized over the column view of all hits
+    soa = hits_to_soa(all_results)
+    modules, module_idx = np.unique(soa["module"], return_inverse=True)
+    best_scores = np.full(len(modules), -np.inf, dtype=np.float32)
+    np.maximum.at(best_scores, module_idx, soa["score"])
+    
+    module_table = Table(title="Best Score by Module", show_header=True, header_style="bold magenta")
+    module_table.add_column("Module", style="cyan")
+    module_table.add_column("Best Score", style="green", justify="right")
+    for module, best in zip(modules, best_scores):
+        module_table.add_row(module, f"{best:.3f}")
     
     # Success criteria
-    success_rate = (len(unique_ids) / stats['total_documents']) * 100 if stats['total_documents'] > 0 else 0
+    success_rate = (len(seen_ids) / stats['total_documents']) * 100 if stats['total_documents'] > 0 else 0
     
     if success_rate >= 60:
-        console.print(f"\n[bold green]✅ RAG System Working Well! ({success_rate:.1f}% document retrieval)[/bold green]")
+        verdict = f"\n[bold green]✅ RAG System Working Well! ({success_rate:.1f}% document retrieval)[/bold green]"
     elif success_rate >= 30:
-        console.print(f"\n[bold yellow]⚠️  RAG System Partially Working ({success_rate:.1f}% document retrieval)[/bold yellow]")
-        console.print("[yellow]   Consider lowering MIN_RELEVANCE_SCORE in config.py[/yellow]")
+        verdict = (
+            f"\n[bold yellow]⚠️  RAG System Partially Working ({success_rate:.1f}% document retrieval)[/bold yellow]\n"
+            "[yellow]   Consider lowering MIN_RELEVANCE_SCORE in config.py[/yellow]"
+        )
     else:
-        console.print(f"\n[bold red]❌ RAG System Needs Tuning ({success_rate:.1f}% document retrieval)[/bold red]")
-        console.print("[red]   Check indexing and query relevance[/red]")
+        verdict = (
+            f"\n[bold red]❌ RAG System Needs Tuning ({success_rate:.1f}% document retrieval)[/bold red]\n"
+            "[red]   Check indexing and query relevance[/red]"
+        )
     
-    console.print("\n[dim]Tip: Lower MIN_RELEVANCE_SCORE in config.py if you want more results[/dim]\n")
+    console.print(Group(
+        Text.from_markup("\n\n[yellow]━━━ Collection Statistics ━━━[/yellow]\n"),
+        stats_panel,
+        Text.from_markup("\n[yellow]━━━ Test Summary ━━━[/yellow]\n"),
+        summary_table,
+        # No hits at all: nothing to tabulate per module
+        *([module_table] if len(modules) else []),
+        Text.from_markup(verdict),
+        Text.from_markup("\n[dim]Tip: Lower MIN_RELEVANCE_SCORE in config.py if you want more results[/dim]\n"),
+    ))
 
 
 if __name__ == "__main__":
-    test_rag_tools()
\ No newline at end of file
+    test_rag_tools()